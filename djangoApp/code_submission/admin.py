@@ -1,2 +1,11 @@
 from django.contrib import admin
 
+from .models import RejudgeJob
+
+
+@admin.register(RejudgeJob)
+class RejudgeJobAdmin(admin.ModelAdmin):
+    list_display = ('problem', 'status', 'completed_count', 'total_count', 'failed_count', 'created_at',
+                    'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('last_solution_id', 'worker', 'started_at', 'heartbeat_at', 'finished_at')
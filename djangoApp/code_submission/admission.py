@@ -0,0 +1,186 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import requests
+from django.conf import settings
+from django.http import JsonResponse
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class JudgeUnavailable(Exception):
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+def judge_unreachable():
+    return JudgeUnavailable("The judge is temporarily unavailable", settings.JUDGE_ADMISSION_RETRY_AFTER)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, error_rate, window, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+
+    def _error_rate_exceeded(self):
+        if len(self._outcomes) < self._outcomes.maxlen:
+            return False
+        return self._outcomes.count(False) / len(self._outcomes) >= self.error_rate
+
+    def _check(self, now):
+        if self.state == OPEN:
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                return False, remaining
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and self._probe_started is not None:
+            remaining = self._probe_started + self.reset_timeout - now
+            if remaining > 0:
+                return False, remaining
+        return True, 0.0
+
+    def allow(self):
+        with self._lock:
+            return self._check(time.monotonic())
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            allowed, retry_after = self._check(now)
+            if not allowed:
+                raise JudgeUnavailable("The judge is temporarily unavailable", retry_after)
+            if self.state == HALF_OPEN:
+                self._probe_started = now
+
+    def release(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_started = None
+
+    def record(self, success):
+        with self._lock:
+            self._outcomes.append(success)
+            if success:
+                self._consecutive_failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    self._probe_started = None
+                return
+
+            self._consecutive_failures += 1
+            if (self.state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold
+                    or self._error_rate_exceeded()):
+                self._open()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._consecutive_failures,
+                "recent_errors": self._outcomes.count(False),
+                "recent_calls": len(self._outcomes),
+            }
+
+
+class JudgeAdmission:
+    def __init__(self, breaker, max_in_flight, max_queue_depth, retry_after):
+        self.breaker = breaker
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.retry_after = retry_after
+        self.queue_depth = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def check(self):
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            raise JudgeUnavailable("The judge is busy, try again shortly", self.retry_after)
+        if self.max_queue_depth and self.queue_depth >= self.max_queue_depth:
+            raise JudgeUnavailable("The judge queue is full, try again shortly", self.retry_after)
+        allowed, retry_after = self.breaker.allow()
+        if not allowed:
+            raise JudgeUnavailable("The judge is temporarily unavailable", retry_after)
+
+    def wait(self):
+        while True:
+            allowed, retry_after = self.breaker.allow()
+            if allowed:
+                return
+            time.sleep(retry_after)
+
+    @contextmanager
+    def running(self):
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self):
+        return dict(self.breaker.stats(), in_flight=self._in_flight, queue_depth=self.queue_depth)
+
+
+_admission = None
+_admission_lock = threading.Lock()
+
+
+def get_admission():
+    global _admission
+    with _admission_lock:
+        if _admission is None:
+            breaker = CircuitBreaker(
+                failure_threshold=settings.JUDGE_CIRCUIT_FAILURE_THRESHOLD,
+                error_rate=settings.JUDGE_CIRCUIT_ERROR_RATE,
+                window=settings.JUDGE_CIRCUIT_WINDOW,
+                reset_timeout=settings.JUDGE_CIRCUIT_RESET_TIMEOUT,
+            )
+            _admission = JudgeAdmission(
+                breaker,
+                max_in_flight=settings.JUDGE_ADMISSION_MAX_IN_FLIGHT,
+                max_queue_depth=settings.JUDGE_ADMISSION_MAX_QUEUE_DEPTH,
+                retry_after=settings.JUDGE_ADMISSION_RETRY_AFTER,
+            )
+        return _admission
+
+
+def unavailable_response(error):
+    response = JsonResponse({"error": str(error)}, status=503)
+    response["Retry-After"] = str(max(1, math.ceil(error.retry_after)))
+    return response
+
+
+def admission_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            get_admission().check()
+        except JudgeUnavailable as e:
+            return unavailable_response(e)
+        try:
+            return view(request, *args, **kwargs)
+        except requests.RequestException:
+            return unavailable_response(judge_unreachable())
+
+    return wrapper
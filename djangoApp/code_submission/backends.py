@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_executor = None
+_executor_lock = threading.Lock()
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+class ExecutionBackend:
+    def probe_first_test(self, language_id):
+        return True
+
+    def run(self, source_code, language_id, test_cases, time_limit, memory_limit, on_done):
+        raise NotImplementedError
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.JUDGE_WORKER_POOL_SIZE,
+                                           thread_name_prefix="judge")
+        return _executor
+
+
+def get_backend_by_name(name):
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = import_string(settings.JUDGE_BACKEND_CLASSES[name])()
+        return _backends[name]
+
+
+def get_backend(language_id):
+    return get_backend_by_name(settings.JUDGE_LANGUAGE_BACKENDS.get(language_id, settings.JUDGE_DEFAULT_BACKEND))
@@ -0,0 +1,109 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .metrics import increment
+
+TIME_LIMIT_EXCEEDED = 5
+COMPILATION_ERROR = 6
+CACHEABLE_STATUSES = [status for status in range(3, 13) if status != TIME_LIMIT_EXCEEDED]
+
+
+class ResultCache:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry = copy.deepcopy(entry[1])
+        increment("judge_result_cache_misses_total" if entry is None else "judge_result_cache_hits_total")
+        return entry
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def normalize_source(source_code):
+    return source_code.replace("\r\n", "\n").rstrip()
+
+
+def _digest(*parts):
+    sha = hashlib.sha256()
+    for part in parts:
+        encoded = str(part).encode("utf-8")
+        sha.update(str(len(encoded)).encode("ascii"))
+        sha.update(b":")
+        sha.update(encoded)
+    return sha.hexdigest()
+
+
+def compile_key(source_code, language_id):
+    return "compile:" + _digest(normalize_source(source_code), language_id)
+
+
+def result_key(source_code, language_id, test_case, time_limit, memory_limit):
+    return "result:" + _digest(normalize_source(source_code), language_id, test_case.stdin,
+                               test_case.expected_output, time_limit, memory_limit)
+
+
+def is_cacheable(result_data):
+    stdout = result_data.get("stdout") or ""
+    return (result_data.get("status", {}).get("id") in CACHEABLE_STATUSES
+            and len(stdout) <= settings.JUDGE_RESULT_CACHE_MAX_OUTPUT)
+
+
+def is_compilation_error(result_data):
+    return result_data.get("status", {}).get("id") == COMPILATION_ERROR
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(settings.JUDGE_RESULT_CACHE_SIZE, settings.JUDGE_RESULT_CACHE_TTL)
+        return _cache
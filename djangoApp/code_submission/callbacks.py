@@ -0,0 +1,66 @@
+import base64
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import JudgeCallback
+
+BASE64_FIELDS = ["stdout", "stderr", "compile_output", "message"]
+STALE_CALLBACK_AGE = timedelta(hours=1)
+
+_arrived = threading.Condition()
+
+
+def callbacks_enabled():
+    return bool(settings.JUDGE_CALLBACK_URL and settings.JUDGE_CALLBACK_SECRET)
+
+
+def callback_url():
+    return f"{settings.JUDGE_CALLBACK_URL.rstrip('/')}/{settings.JUDGE_CALLBACK_SECRET}"
+
+
+def decode_payload(payload):
+    for field in BASE64_FIELDS:
+        if payload.get(field):
+            payload[field] = base64.b64decode(payload[field]).decode("utf-8", errors="replace")
+    return payload
+
+
+def record_callback(payload):
+    if not isinstance(payload, dict) or not isinstance(payload.get("status", {}), dict):
+        raise ValueError("Invalid callback payload")
+    token = payload.get("token")
+    status_id = payload.get("status", {}).get("id")
+    if not token or not isinstance(token, str) or status_id in [1, 2]:
+        return False
+
+    _, created = JudgeCallback.objects.get_or_create(token=token, defaults={"payload": decode_payload(payload)})
+    with _arrived:
+        _arrived.notify_all()
+    return created
+
+
+def wait_for_callbacks(tokens, timeout, on_arrival):
+    deadline = time.monotonic() + timeout
+    delay = settings.JUDGE_POLL_INITIAL_DELAY
+    arrived = set()
+
+    while True:
+        pending = [token for token in tokens if token not in arrived]
+        for callback in JudgeCallback.objects.filter(token__in=pending):
+            arrived.add(callback.token)
+            on_arrival(callback.token, callback.payload)
+
+        remaining = deadline - time.monotonic()
+        if len(arrived) == len(tokens) or remaining <= 0:
+            break
+        with _arrived:
+            _arrived.wait(min(delay, remaining))
+        delay = min(delay * 2, settings.JUDGE_POLL_MAX_DELAY)
+
+    JudgeCallback.objects.filter(token__in=tokens).delete()
+    JudgeCallback.objects.filter(received_at__lt=timezone.now() - STALE_CALLBACK_AGE).delete()
+    return arrived
@@ -0,0 +1,121 @@
+import hashlib
+import math
+import re
+from itertools import zip_longest
+
+MODE_EXACT = "exact"
+MODE_TOKENS = "tokens"
+MODE_LINES = "lines"
+MODE_NUMERIC = "numeric"
+
+CHUNK_SIZE = 65536
+TOKEN_PATTERN = re.compile(r"\S+")
+
+
+def _stripped_bounds(text):
+    start, end = 0, len(text)
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _chunks(text, start, end):
+    for offset in range(start, end, CHUNK_SIZE):
+        yield text[offset:min(offset + CHUNK_SIZE, end)]
+
+
+def _lines(text):
+    start = 0
+    while start <= len(text):
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        yield text[start:end].rstrip()
+        start = end + 1
+
+
+def _tokens(text):
+    return (match.group() for match in TOKEN_PATTERN.finditer(text))
+
+
+def _exact_match(actual, expected):
+    actual_start, actual_end = _stripped_bounds(actual)
+    expected_start, expected_end = _stripped_bounds(expected)
+    if actual_end - actual_start != expected_end - expected_start:
+        return False
+    return all(actual_chunk == expected_chunk for actual_chunk, expected_chunk in zip(
+        _chunks(actual, actual_start, actual_end), _chunks(expected, expected_start, expected_end)))
+
+
+def _lines_match(actual, expected):
+    return all((actual_line or "") == (expected_line or "")
+               for actual_line, expected_line in zip_longest(_lines(actual), _lines(expected)))
+
+
+def _tokens_match(actual, expected):
+    return all(actual_token == expected_token
+               for actual_token, expected_token in zip_longest(_tokens(actual), _tokens(expected)))
+
+
+def _numbers_close(actual_token, expected_token, epsilon):
+    try:
+        actual_number, expected_number = float(actual_token), float(expected_token)
+    except ValueError:
+        return False
+    if not (math.isfinite(actual_number) and math.isfinite(expected_number)):
+        return actual_number == expected_number
+    return abs(actual_number - expected_number) <= epsilon * max(1.0, abs(expected_number))
+
+
+def _numeric_match(actual, expected, epsilon):
+    for actual_token, expected_token in zip_longest(_tokens(actual), _tokens(expected)):
+        if actual_token is None or expected_token is None:
+            return False
+        if actual_token != expected_token and not _numbers_close(actual_token, expected_token, epsilon):
+            return False
+    return True
+
+
+def _normalized_parts(text, mode):
+    if mode == MODE_EXACT:
+        yield from _chunks(text, *_stripped_bounds(text))
+    elif mode == MODE_LINES:
+        blank_lines = 0
+        first = True
+        for line in _lines(text):
+            if not line:
+                blank_lines += 1
+                continue
+            yield "\n" * (blank_lines + (0 if first else 1))
+            yield line
+            blank_lines = 0
+            first = False
+    else:
+        for token in _tokens(text):
+            yield token
+            yield " "
+
+
+def output_digest(text, mode=MODE_EXACT):
+    digest = hashlib.blake2b(digest_size=32)
+    for part in _normalized_parts(text, mode):
+        digest.update(part.encode("utf-8"))
+    return f"{mode}:{digest.hexdigest()}"
+
+
+def outputs_match(actual, expected, mode=MODE_EXACT, epsilon=0.0, expected_digest=None):
+    if expected_digest and expected_digest.startswith(f"{mode}:"):
+        if output_digest(actual, mode) == expected_digest:
+            return True
+        if mode != MODE_NUMERIC:
+            return False
+
+    if mode == MODE_TOKENS:
+        return _tokens_match(actual, expected)
+    if mode == MODE_LINES:
+        return _lines_match(actual, expected)
+    if mode == MODE_NUMERIC:
+        return _numeric_match(actual, expected, epsilon)
+    return _exact_match(actual, expected)
@@ -0,0 +1,90 @@
+import base64
+import io
+import zipfile
+
+MULTI_FILE_LANGUAGE_ID = 89
+MARKER = "@@JUDGE"
+TIMEOUT_EXIT_CODE = 124
+KILLED_EXIT_CODE = 137
+KILL_GRACE_SECONDS = 1
+GROUP_MEMORY_MESSAGE = "Memory is the peak of all tests judged in the same compile-once run"
+
+COMPILED_LANGUAGES = {
+    50: {"source": "main.c", "compile": "/usr/local/gcc-9.2.0/bin/gcc -O2 -o main main.c -lm", "run": "./main"},
+    54: {"source": "main.cpp", "compile": "/usr/local/gcc-9.2.0/bin/g++ -O2 -o main main.cpp", "run": "./main"},
+    62: {"source": "Main.java", "compile": "/usr/local/openjdk13/bin/javac Main.java",
+         "run": "/usr/local/openjdk13/bin/java Main"},
+}
+
+RUN_SCRIPT = """#!/bin/bash
+mkdir -p out err
+for i in $(seq 0 {last}); do
+  start=$(date +%s%N)
+  timeout -k {grace} {timeout} {run} < "tests/$i.in" > "out/$i" 2> "err/$i"
+  code=$?
+  end=$(date +%s%N)
+  echo "{marker} $i $code $(( (end - start) / 1000000 ))"
+  base64 -w0 "out/$i"; echo
+  base64 -w0 "err/$i"; echo
+done
+"""
+
+
+def supports_compile_once(language_id):
+    return language_id in COMPILED_LANGUAGES
+
+
+def build_additional_files(source_code, language_id, test_cases, limits):
+    language = COMPILED_LANGUAGES[language_id]
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(language["source"], source_code)
+        zip_file.writestr("compile", f"#!/bin/bash\n{language['compile']}\n")
+        zip_file.writestr("run", RUN_SCRIPT.format(last=len(test_cases) - 1, timeout=limits.cpu_time,
+                                                   grace=KILL_GRACE_SECONDS, run=language["run"], marker=MARKER))
+        for index, test_case in enumerate(test_cases):
+            zip_file.writestr(f"tests/{index}.in", test_case.stdin)
+    return base64.b64encode(archive.getvalue()).decode("ascii")
+
+
+def _decode(line):
+    return base64.b64decode(line).decode("utf-8", errors="replace")
+
+
+def _test_status(exit_code, elapsed_ms, timeout):
+    if exit_code == 0:
+        return {"id": 3, "description": "Accepted"}
+    if exit_code == TIMEOUT_EXIT_CODE or (exit_code == KILLED_EXIT_CODE and elapsed_ms >= timeout * 1000):
+        return {"id": 5, "description": "Time Limit Exceeded"}
+    if exit_code == KILLED_EXIT_CODE:
+        return {"id": 12, "description": "Runtime Error (Other)"}
+    return {"id": 11, "description": "Runtime Error (NZEC)"}
+
+
+def split_results(result_data, timeout):
+    results = {}
+    lines = (result_data.get("stdout") or "").split("\n")
+    position = 0
+    while position + 2 < len(lines):
+        parts = lines[position].split(" ")
+        if len(parts) != 4 or parts[0] != MARKER:
+            position += 1
+            continue
+
+        try:
+            stdout, stderr = _decode(lines[position + 1]), _decode(lines[position + 2])
+        except ValueError:
+            break
+
+        index, exit_code, elapsed_ms = int(parts[1]), int(parts[2]), int(parts[3])
+        results[index] = {
+            "status": _test_status(exit_code, elapsed_ms, timeout),
+            "stdout": stdout,
+            "stderr": stderr,
+            "time": f"{elapsed_ms / 1000:.3f}",
+            "memory": result_data.get("memory"),
+            "compile_output": result_data.get("compile_output"),
+            "message": GROUP_MEMORY_MESSAGE,
+        }
+        position += 3
+    return results
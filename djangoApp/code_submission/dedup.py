@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+IMPLICIT_KEY_PREFIX = "auto:"
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_single_flight = SingleFlight()
+
+
+def request_fingerprint(endpoint, payload):
+    data = payload.dict() if hasattr(payload, "dict") else dict(payload)
+    data["source_code"] = hashlib.sha256(data.get("source_code", "").encode("utf-8")).hexdigest()
+    return hashlib.sha256(json.dumps([endpoint, data], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _serializable(data):
+    return data.model_dump() if hasattr(data, "model_dump") else data
+
+
+def _claim_idempotency_key(user, key, fingerprint, implicit):
+    now = timezone.now()
+    replay_before = now - timedelta(seconds=settings.JUDGE_DEDUP_WINDOW)
+    IdempotencyKey.objects.filter(
+        Q(created_at__lt=now - timedelta(seconds=settings.JUDGE_IDEMPOTENCY_TTL))
+        | Q(key__startswith=IMPLICIT_KEY_PREFIX, completed_at__lt=replay_before)
+    ).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, request_hash=fingerprint), True
+    except IntegrityError:
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if record is None:
+            return None, False
+
+    stale_before = now - timedelta(seconds=settings.JUDGE_JOB_STALE_AFTER)
+    if record.status == 'IN_PROGRESS' and record.request_hash == fingerprint and record.created_at < stale_before:
+        claimed = IdempotencyKey.objects.filter(id=record.id, created_at=record.created_at).update(created_at=now)
+        return record, bool(claimed)
+    if implicit and record.status == 'DONE' and record.completed_at < replay_before:
+        claimed = IdempotencyKey.objects.filter(id=record.id, completed_at=record.completed_at).update(
+            status='IN_PROGRESS', response_status=None, response=None, created_at=now, completed_at=None)
+        if claimed:
+            record.refresh_from_db()
+        return record, bool(claimed)
+    return record, False
+
+
+def _wait_for_leader(user, key, fingerprint, implicit, flight_key):
+    deadline = time.monotonic() + settings.JUDGE_DEDUP_WAIT_TIMEOUT
+    delay = settings.JUDGE_POLL_INITIAL_DELAY
+    while True:
+        record, created = _claim_idempotency_key(user, key, fingerprint, implicit)
+        if created:
+            return record, None
+        if record is not None:
+            if record.request_hash != fingerprint:
+                return None, (422, {"error": "Idempotency-Key was already used with a different request"})
+            if record.status == 'DONE':
+                return None, (record.response_status, record.response)
+            if _single_flight.in_flight(flight_key):
+                return None, None
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None, (409, {"error": "An identical request is still being processed"})
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, settings.JUDGE_POLL_MAX_DELAY)
+
+
+def deduplicate(request, endpoint, payload, handler):
+    user = request.auth
+    fingerprint = request_fingerprint(endpoint, payload)
+    flight_key = (user.id, fingerprint)
+    idempotency_key = request.headers.get("Idempotency-Key")
+    implicit = not idempotency_key
+    key = IMPLICIT_KEY_PREFIX + fingerprint if implicit else idempotency_key[:255]
+
+    record, replay = _wait_for_leader(user, key, fingerprint, implicit, flight_key)
+    if replay is not None:
+        return replay
+
+    try:
+        status, data = _single_flight.do(flight_key, handler)
+    except Exception:
+        if record is not None:
+            record.delete()
+        raise
+
+    if record is not None:
+        if 200 <= status < 300:
+            record.status = 'DONE'
+            record.response_status = status
+            record.response = _serializable(data)
+            record.completed_at = timezone.now()
+            record.save(update_fields=['status', 'response_status', 'response', 'completed_at'])
+        else:
+            record.delete()
+    return status, data
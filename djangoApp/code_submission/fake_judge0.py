@@ -0,0 +1,243 @@
+import base64
+import json
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = [
+    {"id": 50, "name": "C (GCC 9.2.0)"},
+    {"id": 54, "name": "C++ (GCC 9.2.0)"},
+    {"id": 62, "name": "Java (OpenJDK 13.0.1)"},
+    {"id": 71, "name": "Python (3.8.1)"},
+]
+BASE64_FIELDS = ["stdout", "stderr", "compile_output", "message"]
+
+
+def _timestamp(monotonic):
+    wall_clock = datetime.now(timezone.utc) - timedelta(seconds=time.monotonic() - monotonic)
+    return wall_clock.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class FakeJudge0Config:
+    def __init__(self, latency=0.0, queue_delay=0.05, run_time=0.05, failure_rate=0.0, compile_error_rate=0.0,
+                 time_limit_rate=0.0, workers=4):
+        self.latency = latency
+        self.queue_delay = queue_delay
+        self.run_time = run_time
+        self.failure_rate = failure_rate
+        self.compile_error_rate = compile_error_rate
+        self.time_limit_rate = time_limit_rate
+        self.workers = workers
+
+
+class FakeSubmission:
+    def __init__(self, data, config, starts_at):
+        self.token = str(uuid.uuid4())
+        self.created_at = time.monotonic()
+        self.data = data
+        self.starts_at = starts_at
+        self.run_time = config.run_time
+        roll = random.random()
+        if roll < config.compile_error_rate:
+            self.outcome = "compile_error"
+        elif roll < config.compile_error_rate + config.time_limit_rate:
+            self.outcome = "time_limit"
+        else:
+            self.outcome = "accepted"
+
+    @property
+    def finishes_at(self):
+        return self.starts_at + self.run_time
+
+    def status_id(self):
+        now = time.monotonic()
+        if now < self.starts_at:
+            return 1
+        if now < self.finishes_at:
+            return 2
+        return {"accepted": 3, "time_limit": 5, "compile_error": 6}[self.outcome]
+
+    def as_dict(self, fields=None):
+        status_id = self.status_id()
+        finished = status_id > 2
+        descriptions = {1: "In Queue", 2: "Processing", 3: "Accepted", 5: "Time Limit Exceeded",
+                        6: "Compilation Error"}
+        result = {
+            "token": self.token,
+            "status": {"id": status_id, "description": descriptions[status_id]},
+            "stdout": self.data.get("stdin") if status_id == 3 else None,
+            "stderr": None,
+            "compile_output": "main.c: error: expected ';'" if status_id == 6 else None,
+            "message": None,
+            "time": f"{self.run_time:.3f}" if finished else None,
+            "wall_time": f"{self.run_time:.3f}" if finished else None,
+            "memory": 1024 if finished else None,
+            "created_at": _timestamp(self.created_at),
+            "finished_at": _timestamp(self.finishes_at) if finished else None,
+        }
+        if fields:
+            result = {field: result.get(field) for field in fields}
+        return result
+
+
+class FakeJudge0State:
+    def __init__(self, config):
+        self.config = config
+        self.submissions = {}
+        self.request_counts = {}
+        self.worker_free_at = [0.0] * config.workers
+        self.lock = threading.Lock()
+
+    def count(self, endpoint):
+        with self.lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+    def total_requests(self):
+        with self.lock:
+            return sum(self.request_counts.values())
+
+    def create(self, data):
+        with self.lock:
+            worker = min(range(len(self.worker_free_at)), key=self.worker_free_at.__getitem__)
+            starts_at = max(time.monotonic() + self.config.queue_delay, self.worker_free_at[worker])
+            submission = FakeSubmission(data, self.config, starts_at)
+            self.worker_free_at[worker] = submission.finishes_at
+            self.submissions[submission.token] = submission
+        if data.get("callback_url"):
+            delay = max(0.0, submission.finishes_at - time.monotonic())
+            threading.Timer(delay, self._send_callback, [submission, data["callback_url"]]).start()
+        return submission
+
+    def _send_callback(self, submission, url):
+        payload = submission.as_dict()
+        for field in BASE64_FIELDS:
+            if payload.get(field):
+                payload[field] = base64.b64encode(payload[field].encode("utf-8")).decode("ascii")
+        request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), method="PUT",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            urllib.request.urlopen(request, timeout=5).read()
+        except OSError:
+            pass
+
+    def workers(self):
+        with self.lock:
+            statuses = [submission.status_id() for submission in self.submissions.values()]
+        working = statuses.count(2)
+        return [{"queue": "default", "size": statuses.count(1), "available": self.config.workers,
+                 "idle": self.config.workers - working, "working": working, "paused": 0, "failed": 0}]
+
+
+class FakeJudge0Handler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def _prepare(self, endpoint):
+        self.state.count(endpoint)
+        if self.state.config.latency:
+            time.sleep(self.state.config.latency)
+        if random.random() < self.state.config.failure_rate:
+            self._send(503, {"error": "Injected failure"})
+            return False
+        return True
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        fields = query["fields"][0].split(",") if "fields" in query else None
+
+        if url.path == "/submissions/batch":
+            if not self._prepare("POST /submissions/batch"):
+                return
+            body = self._read_json()
+            self._send(201, [{"token": self.state.create(data).token} for data in body.get("submissions", [])])
+        elif url.path == "/submissions":
+            if not self._prepare("POST /submissions"):
+                return
+            submission = self.state.create(self._read_json())
+            if query.get("wait") == ["true"]:
+                time.sleep(max(0.0, submission.finishes_at - time.monotonic()))
+                self._send(201, submission.as_dict(fields))
+            else:
+                self._send(201, {"token": submission.token})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        fields = query["fields"][0].split(",") if "fields" in query else None
+
+        if url.path == "/submissions/batch":
+            if not self._prepare("GET /submissions/batch"):
+                return
+            tokens = query.get("tokens", [""])[0].split(",")
+            with self.state.lock:
+                submissions = [self.state.submissions.get(token) for token in tokens]
+            self._send(200, {"submissions": [submission.as_dict(fields) if submission else None
+                                             for submission in submissions]})
+        elif url.path.startswith("/submissions/"):
+            if not self._prepare("GET /submissions/{token}"):
+                return
+            with self.state.lock:
+                submission = self.state.submissions.get(url.path.rsplit("/", 1)[-1])
+            if submission is None:
+                self._send(404, {"error": "Not found"})
+            else:
+                self._send(200, submission.as_dict(fields))
+        elif url.path == "/languages":
+            if self._prepare("GET /languages"):
+                self._send(200, LANGUAGES)
+        elif url.path == "/system_info":
+            if self._prepare("GET /system_info"):
+                self._send(200, {"Architecture": "x86_64", "CPU(s)": str(self.state.config.workers)})
+        elif url.path == "/workers":
+            if self._prepare("GET /workers"):
+                self._send(200, self.state.workers())
+        else:
+            self._send(404, {"error": "Not found"})
+
+
+class FakeJudge0Server:
+    def __init__(self, config, host="127.0.0.1", port=0):
+        self.state = FakeJudge0State(config)
+        handler = type("BoundFakeJudge0Handler", (FakeJudge0Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,121 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from problems.models import TestCase
+from .backends import get_backend
+from .models import OutputGenerationJob
+from .scheduler import PRIORITY_VERIFY, get_scheduler
+
+ACCEPTED = 3
+
+
+def queue_output_generation(problem, requested_by=None, overwrite=False, apply_limits=False):
+    return OutputGenerationJob.objects.create(problem=problem, requested_by=requested_by, overwrite=overwrite,
+                                              apply_limits=apply_limits)
+
+
+def claim_generation_job(worker_name):
+    stale_before = timezone.now() - timedelta(seconds=settings.JUDGE_JOB_STALE_AFTER)
+    with transaction.atomic():
+        job = (OutputGenerationJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(Q(status='PENDING') | Q(status='RUNNING', heartbeat_at__lt=stale_before))
+               .order_by('created_at')
+               .first())
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = 'RUNNING'
+        job.worker = worker_name
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        job.save(update_fields=['status', 'worker', 'started_at', 'heartbeat_at'])
+        return job
+
+
+def suggested_limits(problem):
+    reference = problem.test_cases.aggregate(time=Max('reference_time'), memory=Max('reference_memory'))
+    if reference['time'] is None or reference['memory'] is None:
+        return None, None
+    time_limit = max(1, math.ceil(reference['time'] * settings.JUDGE_REFERENCE_TIME_FACTOR))
+    memory_limit = max(2048, math.ceil(reference['memory'] * settings.JUDGE_REFERENCE_MEMORY_FACTOR))
+    return time_limit, memory_limit
+
+
+def _generate_chunk(job, problem, test_cases):
+    outcomes = {}
+
+    def on_done(index, result_data):
+        outcomes[index] = result_data
+
+    with get_scheduler().slot(PRIORITY_VERIFY, job.requested_by_id, len(test_cases)):
+        if not get_backend(problem.solution_language_id).run(
+                problem.solution_code, problem.solution_language_id, test_cases, settings.JUDGE_MAX_CPU_TIME_LIMIT,
+                settings.JUDGE_GENERATION_MEMORY_LIMIT, on_done):
+            raise ValueError("Failed to get token")
+
+    errors = []
+    for index, test_case in enumerate(test_cases):
+        result_data = outcomes.get(index) or {}
+        status = result_data.get("status") or {}
+        if status.get("id") != ACCEPTED:
+            job.failed_count += 1
+            errors.append(f"Test case {test_case.id}: {status.get('description', 'no result')}")
+            continue
+
+        update_fields = ['reference_time', 'reference_memory']
+        if job.overwrite or test_case.output_pending or not test_case.expected_output:
+            test_case.expected_output = result_data.get("stdout") or ""
+            test_case.output_pending = False
+            test_case.problem = problem
+            update_fields += ['expected_output', 'expected_digest', 'output_pending', 'updated_at']
+        test_case.reference_time = float(result_data.get("time") or 0)
+        test_case.reference_memory = result_data.get("memory") or 0
+        test_case.save(update_fields=update_fields)
+        if test_case.reference_time > problem.time_limit or test_case.reference_memory > problem.memory_limit:
+            job.over_limit_count += 1
+    return errors
+
+
+def run_output_generation(job):
+    problem = job.problem
+    test_cases = TestCase.objects.filter(problem=problem).order_by('id')
+    if not job.overwrite:
+        test_cases = test_cases.filter(Q(expected_output='') | Q(reference_time__isnull=True) | Q(output_pending=True))
+    job.total_count = job.completed_count + test_cases.filter(id__gt=job.last_test_case_id).count()
+    job.save(update_fields=['total_count'])
+
+    try:
+        if problem.solution_language_id is None:
+            raise ValueError("The problem has no solution language set")
+        while True:
+            chunk = list(test_cases.filter(id__gt=job.last_test_case_id)[:settings.JUDGE_GENERATION_CHUNK_SIZE])
+            if not chunk:
+                break
+
+            errors = _generate_chunk(job, problem, chunk)
+            job.completed_count += len(chunk)
+            job.last_test_case_id = chunk[-1].id
+            job.heartbeat_at = timezone.now()
+            if errors:
+                job.error = "\n".join([job.error, *errors]).strip()
+            job.save(update_fields=['completed_count', 'failed_count', 'over_limit_count', 'last_test_case_id',
+                                    'heartbeat_at', 'error'])
+
+        job.suggested_time_limit, job.suggested_memory_limit = suggested_limits(problem)
+        if job.apply_limits and job.suggested_time_limit is not None:
+            type(problem).objects.filter(id=problem.id).update(time_limit=job.suggested_time_limit,
+                                                               memory_limit=job.suggested_memory_limit)
+        job.status = 'DONE'
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = "\n".join([job.error, str(e)]).strip()
+    job.finished_at = timezone.now()
+    job.save(update_fields=['suggested_time_limit', 'suggested_memory_limit', 'status', 'error', 'finished_at'])
+    return job
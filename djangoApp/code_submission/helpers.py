@@ -1,72 +1,236 @@
-import os
-
-import requests
-from dotenv import load_dotenv
-
-load_dotenv()
-
-judge0_url = os.environ.get("JUDGE_URL").strip()
-
-
-def submit_and_test_code(source_code, language_id, test_cases, memory_limit, time_limit):
-    results = []
-    passed_count = 0
-
-    for test_case in test_cases:
-        passed = False
-        api_url = f"{judge0_url}/submissions?base64_encoded=false"
-        headers = {"Content-Type": "application/json"}
-        data = {
-            "source_code": source_code,
-            "language_id": language_id,
-            "stdin": test_case.stdin,
-            "cpu_time_limit": time_limit,
-            "cpu_extra_time": 1,
-            "wall_time_limit": 20.0,
-        }
-        response = requests.post(api_url, json=data, headers=headers)
-        token = response.json().get("token")
-
-        if not token:
-            return 400, {"error": "Failed to get token"}
-
-        result_url = f"{judge0_url}/submissions/{token}?base64_encoded=false"
-        status_id = 1
-        while status_id in [1, 2]:
-            result_response = requests.get(result_url, headers=headers)
-            result_data = result_response.json()
-            status_id = result_data.get("status", {}).get("id")
-            if status_id in [1, 2]:
-                continue
-
-        memory_exceeded = result_data.get("memory", 0) > memory_limit
-        time_exceeded = float(result_data.get("time", 0)) > time_limit
-
-        if result_data.get("stdout") is None:
-            result_data["stdout"] = ""
-        passed = (result_data.get("stdout", "").strip() == test_case.expected_output.strip()
-                  and not (memory_exceeded or time_exceeded))
-
-        if memory_exceeded:
-            result_data["status"]["description"] = "Memory Limit Exceeded"
-        elif time_exceeded:
-            result_data["status"]["description"] = "Time Limit Exceeded"
-
-        if passed:
-            passed_count += 1
-
-        results.append({
-            "test_case_id": test_case.id,
-            "input": test_case.stdin,
-            "expected_output": test_case.expected_output,
-            "actual_output": result_data.get("stdout", ""),
-            "status": result_data.get("status", {}).get("description", ""),
-            "passed": passed,
-            "memory_exceeded": memory_exceeded,
-            "time_exceeded": time_exceeded,
-            "compile_output": result_data.get("compile_output", ""),
-            "stderr": result_data.get("stderr", ""),
-            "message": result_data.get("message", "")
-        })
-
-    return 200, {"results": results, "passed_count": passed_count, "total_count": len(test_cases)}
+import time
+
+from django.conf import settings
+
+from problems.models import TestCase
+from solutions.models import SolutionTestResult
+from .admission import get_admission
+from .backends import get_backend
+from .cache import compile_key, get_result_cache, is_cacheable, is_compilation_error, result_key
+from .comparators import MODE_EXACT, outputs_match
+from .limits import memory_limit_exceeded
+from .metrics import labelled, observe, observe_sandbox_timings
+from .scheduler import PRIORITY_GRADED, get_scheduler
+from .spool import OutputSpool
+
+POLICY_FULL = "full"
+POLICY_FIRST_FAILURE = "first_failure"
+COMPACT_FIELDS = ["test_case_id", "passed", "verdict", "time_ms", "memory_kb"]
+OUTPUT_FIELDS = ["actual_output", "stderr", "compile_output"]
+PREVIEW_FIELDS = ["test_case_id", "status", "passed", "verdict", "time_ms", "memory_kb", "skipped"]
+RUN_MODE_SAMPLES = "samples"
+RUN_MODE_CUSTOM = "custom"
+
+
+def result_verdict(status_id, passed, memory_exceeded, time_exceeded):
+    if passed:
+        return SolutionTestResult.ACCEPTED
+    if passed is None and status_id == 3:
+        return SolutionTestResult.RAN
+    if status_id == 6:
+        return SolutionTestResult.COMPILATION_ERROR
+    if time_exceeded or status_id == 5:
+        return SolutionTestResult.TIME_LIMIT_EXCEEDED
+    if memory_exceeded:
+        return SolutionTestResult.MEMORY_LIMIT_EXCEEDED
+    if status_id in range(7, 13):
+        return SolutionTestResult.RUNTIME_ERROR
+    if status_id == 3:
+        return SolutionTestResult.WRONG_ANSWER
+    return SolutionTestResult.INTERNAL_ERROR
+
+
+def sample_test_cases(problem):
+    samples = list(TestCase.objects.filter(problem=problem, is_sample=True, output_pending=False))
+    if not samples and problem.example_input:
+        samples = [TestCase(id=0, problem=problem, stdin=problem.example_input,
+                            expected_output=problem.example_output)]
+    return samples
+
+
+def custom_test_case(problem, stdin):
+    return TestCase(id=0, problem=problem, stdin=stdin, expected_output=None)
+
+
+def compact_result(result):
+    compact = {field: result[field] for field in COMPACT_FIELDS}
+    compact.update({field: output_preview(result[field]) for field in OUTPUT_FIELDS})
+    return compact
+
+
+def output_preview(text):
+    text = text or ""
+    limit = settings.JUDGE_PREVIEW_LENGTH
+    size = len(text.encode("utf-8"))
+    if len(text) <= 2 * limit:
+        return {"head": text, "tail": "", "bytes": size, "truncated": False}
+    return {"head": text[:limit], "tail": text[-limit:], "bytes": size, "truncated": True}
+
+
+def preview_result(result):
+    preview = {field: result[field] for field in PREVIEW_FIELDS}
+    preview.update({field: output_preview(result[field]) for field in OUTPUT_FIELDS})
+    return preview
+
+
+def evaluate_result(test_case, result_data, memory_limit, comparison_mode=MODE_EXACT, epsilon=0.0):
+    status_id = result_data.get("status", {}).get("id")
+    memory_exceeded = memory_limit_exceeded(result_data, memory_limit)
+    time_exceeded = status_id == 5
+
+    if result_data.get("stdout") is None:
+        result_data["stdout"] = ""
+    if test_case.expected_output is None:
+        passed = None
+    else:
+        compare_started = time.monotonic()
+        passed = status_id == 3 and outputs_match(result_data["stdout"], test_case.expected_output, comparison_mode,
+                                                  epsilon, getattr(test_case, "expected_digest", None))
+        observe("judge_compare_seconds", time.monotonic() - compare_started)
+
+    if memory_exceeded:
+        result_data["status"]["description"] = "Memory Limit Exceeded"
+    elif passed is None and status_id == 3:
+        result_data["status"]["description"] = "Ran"
+
+    return {
+        "test_case_id": test_case.id,
+        "input": test_case.stdin,
+        "expected_output": test_case.expected_output,
+        "actual_output": result_data.get("stdout", ""),
+        "status": result_data.get("status", {}).get("description", ""),
+        "passed": passed,
+        "memory_exceeded": memory_exceeded,
+        "time_exceeded": time_exceeded,
+        "compile_output": result_data.get("compile_output", ""),
+        "stderr": result_data.get("stderr", ""),
+        "message": result_data.get("message", ""),
+        "poll_count": result_data.get("poll_count"),
+        "wait_time": result_data.get("wait_time"),
+        "cached": result_data.get("cached", False),
+        "skipped": False,
+        "verdict": result_verdict(status_id, passed, memory_exceeded, time_exceeded),
+        "time_ms": round(float(result_data["time"]) * 1000) if result_data.get("time") is not None else None,
+        "memory_kb": result_data.get("memory")
+    }
+
+
+def skipped_result(test_case):
+    return {
+        "test_case_id": test_case.id,
+        "input": test_case.stdin,
+        "expected_output": test_case.expected_output,
+        "actual_output": "",
+        "status": "Skipped",
+        "passed": False,
+        "memory_exceeded": False,
+        "time_exceeded": False,
+        "compile_output": "",
+        "stderr": "",
+        "message": "",
+        "poll_count": 0,
+        "wait_time": 0.0,
+        "cached": False,
+        "skipped": True,
+        "verdict": SolutionTestResult.SKIPPED,
+        "time_ms": None,
+        "memory_kb": None
+    }
+
+
+def _cached_result(result_data):
+    return dict(result_data, poll_count=0, wait_time=0.0, cached=True)
+
+
+def _wave_size(policy, judged_count, remaining_count, probe):
+    if judged_count == 0 and remaining_count > 1 and probe:
+        return 1
+    if policy == POLICY_FIRST_FAILURE:
+        return settings.JUDGE_FAIL_FAST_WAVE_SIZE
+    return remaining_count
+
+
+def submit_and_test_code(source_code, language_id, test_cases, memory_limit, time_limit, on_result=None,
+                         policy=POLICY_FULL, priority=PRIORITY_GRADED, flow=None, collect_results=True,
+                         comparison_mode=MODE_EXACT, epsilon=0.0, problem_id=None):
+    with labelled(language_id, problem_id), get_admission().running():
+        return _submit_and_test_code(source_code, language_id, test_cases, memory_limit, time_limit, on_result,
+                                     policy, priority, flow, collect_results, comparison_mode, epsilon)
+
+
+def _submit_and_test_code(source_code, language_id, test_cases, memory_limit, time_limit, on_result, policy, priority,
+                          flow, collect_results, comparison_mode, epsilon):
+    test_cases = list(test_cases)
+    backend = get_backend(language_id)
+    probe = policy == POLICY_FIRST_FAILURE and settings.JUDGE_PROBE_FIRST_TEST and backend.probe_first_test(language_id)
+    cache = get_result_cache()
+    results = [None] * len(test_cases)
+    outputs = None if collect_results else OutputSpool()
+    keys = [result_key(source_code, language_id, test_case, time_limit, memory_limit) for test_case in test_cases]
+    stop = False
+
+    def collect(index, result):
+        if collect_results:
+            results[index] = result
+        else:
+            outputs.write(index, {field: result[field] for field in OUTPUT_FIELDS})
+            results[index] = compact_result(result)
+
+    def on_done(index, result_data):
+        nonlocal stop
+        result = evaluate_result(test_cases[index], result_data, memory_limit, comparison_mode, epsilon)
+        collect(index, result)
+        if is_compilation_error(result_data) or (policy == POLICY_FIRST_FAILURE and not result["passed"]):
+            stop = True
+        if on_result:
+            on_result(result)
+
+    with get_scheduler().slot(priority, flow, len(test_cases)):
+        remaining = list(range(len(test_cases)))
+        judged_count = 0
+        while remaining and not stop:
+            size = _wave_size(policy, judged_count, len(remaining), probe)
+            wave, remaining = remaining[:size], remaining[size:]
+            judged_count += len(wave)
+
+            compile_error = cache.get(compile_key(source_code, language_id))
+            if compile_error is not None:
+                on_done(wave[0], _cached_result(compile_error))
+                remaining = wave[1:] + remaining
+                break
+
+            pending = []
+            for index in wave:
+                cached = cache.get(keys[index])
+                if cached is not None:
+                    on_done(index, _cached_result(cached))
+                else:
+                    pending.append(index)
+
+            def on_judged(position, result_data):
+                index = pending[position]
+                observe_sandbox_timings(result_data)
+                if is_compilation_error(result_data):
+                    cache.set(compile_key(source_code, language_id), result_data)
+                elif is_cacheable(result_data):
+                    cache.set(keys[index], result_data)
+                on_done(index, result_data)
+
+            if pending and not backend.run(source_code, language_id, [test_cases[index] for index in pending],
+                                           time_limit, memory_limit, on_judged):
+                if outputs is not None:
+                    outputs.close()
+                return 400, {"error": "Failed to get token"}
+
+    for index in remaining:
+        result = skipped_result(test_cases[index])
+        collect(index, result)
+        if on_result:
+            on_result(result)
+
+    passed_count = sum(1 for result in results if result["passed"])
+
+    result_data = {"results": results, "passed_count": passed_count, "total_count": len(test_cases)}
+    if outputs is not None:
+        result_data["outputs"] = outputs
+    return 200, result_data
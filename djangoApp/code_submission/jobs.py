@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from problems.models import TestCase
+from solutions.helpers import create_solution
+from .helpers import submit_and_test_code
+from .metrics import timed
+from .models import SubmissionJob
+from .scheduler import submission_priority
+
+
+def claim_job(worker_name):
+    stale_before = timezone.now() - timedelta(seconds=settings.JUDGE_JOB_STALE_AFTER)
+    with transaction.atomic():
+        job = (SubmissionJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(Q(status='PENDING') | Q(status='RUNNING', heartbeat_at__lt=stale_before))
+               .order_by('-priority', 'created_at')
+               .first())
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = 'RUNNING'
+        job.worker = worker_name
+        job.started_at = now
+        job.heartbeat_at = now
+        job.completed_count = 0
+        job.results = []
+        job.save(update_fields=['status', 'worker', 'started_at', 'heartbeat_at', 'completed_count', 'results'])
+        return job
+
+
+def run_job(job):
+    problem = job.problem
+    test_cases = TestCase.objects.filter(problem=problem, output_pending=False)
+    job.total_count = len(test_cases)
+    job.save(update_fields=['total_count'])
+
+    def on_result(result):
+        job.results.append(result)
+        job.completed_count = len(job.results)
+        job.heartbeat_at = timezone.now()
+        job.save(update_fields=['results', 'completed_count', 'heartbeat_at'])
+
+    try:
+        status, result_data = submit_and_test_code(job.source_code, job.language_id, test_cases,
+                                                   problem.memory_limit, problem.time_limit, on_result=on_result,
+                                                   policy=settings.JUDGE_SUBMIT_POLICY or problem.judge_policy,
+                                                   priority=submission_priority(job.homework), flow=job.user_id,
+                                                   comparison_mode=problem.comparison_mode,
+                                                   epsilon=problem.comparison_epsilon, problem_id=problem.id)
+        if status != 200:
+            raise ValueError(result_data.get("error", "Judging failed"))
+
+        passed_count = result_data["passed_count"]
+        total_count = result_data["total_count"]
+        percentage_passed = int((passed_count / total_count) * 100) if total_count else 0
+
+        with transaction.atomic(), timed("judge_solution_write_seconds", job.language_id, problem.id):
+            create_solution(job.user, problem, job.source_code, job.language_id, percentage_passed, job.homework,
+                            results=result_data["results"])
+            job.results = result_data["results"]
+            job.percentage_passed = percentage_passed
+            job.status = 'DONE'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['results', 'percentage_passed', 'status', 'finished_at'])
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
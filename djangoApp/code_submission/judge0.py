@@ -0,0 +1,546 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from contextvars import copy_context
+
+import requests
+from django.conf import settings
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .admission import get_admission
+from .backends import ExecutionBackend, get_executor
+from .cache import is_compilation_error
+from .callbacks import callback_url, callbacks_enabled, wait_for_callbacks
+from .compile_once import MULTI_FILE_LANGUAGE_ID, build_additional_files, split_results, supports_compile_once
+from .limits import sandbox_limits
+from .metrics import timed
+
+load_dotenv()
+
+JUDGE0_BATCH_SIZE = 20
+JUDGE0_RESULT_FIELDS = "token,status,stdout,time,wall_time,memory,stderr,compile_output,message,created_at,finished_at"
+PENDING_STATUSES = [1, 2]
+INTERNAL_ERROR_STATUS = 13
+RETRY_STATUSES = [500, 502, 503, 504]
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+
+class Judge0Client:
+    def __init__(self, base_url, pool_size, connect_timeout, read_timeout, retries, retry_backoff, max_in_flight):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._stats_lock = threading.Lock()
+        self._latency = {}
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, endpoint=None, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = f"{method} {endpoint or path}"
+        started = time.monotonic()
+        failed = True
+        try:
+            with self._in_flight:
+                response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            if response.status_code >= 500:
+                response.raise_for_status()
+            failed = False
+            return response
+        finally:
+            self._record(endpoint, time.monotonic() - started, failed)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def _record(self, endpoint, elapsed, failed):
+        with self._stats_lock:
+            stats = self._latency.setdefault(endpoint, {"count": 0, "errors": 0, "total_seconds": 0.0,
+                                                        "max_seconds": 0.0})
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                endpoint: dict(stats, avg_seconds=stats["total_seconds"] / stats["count"])
+                for endpoint, stats in self._latency.items()
+            }
+
+
+class Judge0Node:
+    def __init__(self, client):
+        self.client = client
+        self.healthy = True
+        self.failures = 0
+        self.outstanding = 0
+        self.queue_size = 0
+        self.available_workers = None
+        self.last_checked = None
+        self.last_error = None
+
+    def stats(self):
+        return {
+            "url": self.client.base_url,
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "outstanding": self.outstanding,
+            "queue_size": self.queue_size,
+            "available_workers": self.available_workers,
+            "last_error": self.last_error,
+            "endpoints": self.client.stats(),
+        }
+
+
+class Judge0Pool:
+    def __init__(self, clients, check_interval, check_timeout, failure_threshold):
+        self.nodes = [Judge0Node(client) for client in clients]
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._checker = None
+
+    def _choose(self):
+        candidates = [node for node in self.nodes if node.healthy] or self.nodes
+        return min(candidates, key=lambda node: (node.outstanding, node.queue_size, random.random()))
+
+    def least_loaded(self):
+        with self._lock:
+            return self._choose()
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            node = self._choose()
+            node.outstanding += 1
+        try:
+            yield node.client
+        except requests.RequestException as e:
+            self._record_failure(node, str(e))
+            raise
+        finally:
+            with self._lock:
+                node.outstanding -= 1
+
+    def _record_failure(self, node, error):
+        with self._lock:
+            node.failures += 1
+            node.last_error = error
+            if node.failures >= self.failure_threshold:
+                node.healthy = False
+
+    def _record_success(self, node, queue_size, available_workers):
+        with self._lock:
+            node.failures = 0
+            node.last_error = None
+            node.healthy = True
+            node.queue_size = queue_size
+            node.available_workers = available_workers
+
+    def check(self, node):
+        node.last_checked = time.time()
+        try:
+            node.client.get("/system_info", timeout=self.check_timeout).raise_for_status()
+            response = node.client.get("/workers", timeout=self.check_timeout)
+            response.raise_for_status()
+            queues = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self._record_failure(node, str(e))
+            return
+
+        available_workers = sum(queue.get("available", 0) for queue in queues)
+        if not available_workers:
+            self._record_failure(node, "No available workers")
+            return
+        self._record_success(node, sum(queue.get("size", 0) for queue in queues), available_workers)
+
+    def check_all(self):
+        for node in self.nodes:
+            self.check(node)
+        with self._lock:
+            get_admission().queue_depth = sum(node.queue_size for node in self.nodes if node.healthy)
+
+    def _check_loop(self):
+        while not self._stopped.wait(self.check_interval):
+            self.check_all()
+
+    def start(self):
+        if (len(self.nodes) > 1 or settings.JUDGE_ADMISSION_MAX_QUEUE_DEPTH) and self.check_interval > 0:
+            self._checker = threading.Thread(target=self._check_loop, name="judge0-health", daemon=True)
+            self._checker.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def stats(self):
+        with self._lock:
+            return [node.stats() for node in self.nodes]
+
+
+def _judge_urls():
+    urls = os.environ.get("JUDGE_URLS") or os.environ.get("JUDGE_URL")
+    return [url.strip() for url in urls.split(",") if url.strip()]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            clients = [
+                Judge0Client(
+                    url,
+                    pool_size=settings.JUDGE_HTTP_POOL_SIZE,
+                    connect_timeout=settings.JUDGE_CONNECT_TIMEOUT,
+                    read_timeout=settings.JUDGE_READ_TIMEOUT,
+                    retries=settings.JUDGE_HTTP_RETRIES,
+                    retry_backoff=settings.JUDGE_HTTP_RETRY_BACKOFF,
+                    max_in_flight=settings.JUDGE_MAX_IN_FLIGHT_REQUESTS,
+                )
+                for url in _judge_urls()
+            ]
+            _pool = Judge0Pool(
+                clients,
+                check_interval=settings.JUDGE_HEALTH_CHECK_INTERVAL,
+                check_timeout=settings.JUDGE_HEALTH_CHECK_TIMEOUT,
+                failure_threshold=settings.JUDGE_NODE_FAILURE_THRESHOLD,
+            ).start()
+        return _pool
+
+
+def reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+        _pool = None
+
+
+def get_client():
+    return get_pool().least_loaded().client
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class PollBackoff:
+    def __init__(self, time_limit, count=1):
+        self.started = time.monotonic()
+        self.deadline = (self.started + settings.JUDGE_POLL_DEADLINE_GRACE
+                         + settings.JUDGE_POLL_DEADLINE_FACTOR * time_limit * count)
+        self.delay = settings.JUDGE_POLL_INITIAL_DELAY
+        self.poll_count = 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    def wait(self):
+        remaining = self.deadline - time.monotonic()
+        time.sleep(max(0.0, min(random.uniform(self.delay / 2, self.delay), remaining)))
+        self.delay = min(self.delay * 2, settings.JUDGE_POLL_MAX_DELAY)
+        self.poll_count += 1
+
+
+def _timed_out_result():
+    return {"status": {"id": 13, "description": "Judge Timeout"}, "stdout": None, "time": None, "memory": None,
+            "stderr": None, "compile_output": None, "message": "Judge0 did not finish before the deadline"}
+
+
+def _internal_error_result(message):
+    return {"status": {"id": INTERNAL_ERROR_STATUS, "description": "Internal Error"}, "stdout": None, "time": None,
+            "memory": None, "stderr": None, "compile_output": None, "message": message}
+
+
+def _json_or_none(response):
+    if not response.ok:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def _with_poll_stats(result_data, backoff):
+    result_data["poll_count"] = backoff.poll_count
+    result_data["wait_time"] = round(backoff.elapsed, 3)
+    return result_data
+
+
+def _submission_data(source_code, language_id, test_case, limits, callback=True):
+    data = {
+        "source_code": source_code,
+        "language_id": language_id,
+        "stdin": test_case.stdin,
+        "cpu_time_limit": limits.cpu_time,
+        "cpu_extra_time": settings.JUDGE_CPU_EXTRA_TIME,
+        "wall_time_limit": limits.wall_time,
+        "memory_limit": limits.memory_kb,
+    }
+    if callback and callbacks_enabled():
+        data["callback_url"] = callback_url()
+    return data
+
+
+def create_batch(client, source_code, language_id, test_cases, limits):
+    data = {
+        "submissions": [
+            _submission_data(source_code, language_id, test_case, limits) for test_case in test_cases
+        ]
+    }
+    with timed("judge_judge0_create_seconds"):
+        response = client.post("/submissions/batch", params={"base64_encoded": "false"}, json=data)
+    items = _json_or_none(response)
+    if not isinstance(items, list):
+        return []
+    return [item.get("token") if isinstance(item, dict) else None for item in items]
+
+
+def wait_for_batch(client, tokens, time_limit, on_done):
+    backoff = PollBackoff(time_limit, len(tokens))
+    pending = list(tokens)
+
+    while pending:
+        if backoff.expired():
+            for token in pending:
+                on_done(token, _with_poll_stats(_timed_out_result(), backoff))
+            break
+        backoff.wait()
+
+        params = {"tokens": ",".join(pending), "base64_encoded": "false", "fields": JUDGE0_RESULT_FIELDS}
+        response = client.get("/submissions/batch", params=params)
+        body = _json_or_none(response)
+        submissions = body.get("submissions") if isinstance(body, dict) else None
+        if not isinstance(submissions, list):
+            submissions = []
+        submissions = submissions[:len(pending)] + [None] * (len(pending) - len(submissions))
+
+        still_pending = []
+        for token, result_data in zip(pending, submissions):
+            if not isinstance(result_data, dict):
+                on_done(token, _with_poll_stats(_internal_error_result("Judge0 returned no result for this submission"),
+                                                backoff))
+                continue
+            status_id = (result_data.get("status") or {}).get("id")
+            if status_id in PENDING_STATUSES:
+                still_pending.append(token)
+            else:
+                on_done(token, _with_poll_stats(result_data, backoff))
+
+        pending = still_pending
+
+
+def run_single(client, source_code, language_id, test_case, limits):
+    wait = limits.cpu_time <= settings.JUDGE_WAIT_MAX_TIME_LIMIT and not callbacks_enabled()
+    backoff = PollBackoff(limits.wall_time)
+    params = {"base64_encoded": "false", "wait": str(wait).lower(), "fields": JUDGE0_RESULT_FIELDS}
+    data = _submission_data(source_code, language_id, test_case, limits)
+    if wait:
+        response = client.post("/submissions", params=params, json=data)
+    else:
+        with timed("judge_judge0_create_seconds"):
+            response = client.post("/submissions", params=params, json=data)
+    result_data = response.json()
+    token = result_data.get("token")
+
+    if wait and result_data.get("status", {}).get("id") not in [None, *PENDING_STATUSES]:
+        return _with_poll_stats(result_data, backoff)
+    if not token or callbacks_enabled():
+        return token
+
+    return wait_for_single(client, token, backoff)
+
+
+def wait_for_single(client, token, backoff):
+    params = {"base64_encoded": "false", "fields": JUDGE0_RESULT_FIELDS}
+    while True:
+        if backoff.expired():
+            return _with_poll_stats(_timed_out_result(), backoff)
+        backoff.wait()
+        result_response = client.get(f"/submissions/{token}", endpoint="/submissions/{token}", params=params)
+        result_data = result_response.json()
+        if result_data.get("status", {}).get("id") not in PENDING_STATUSES:
+            return _with_poll_stats(result_data, backoff)
+
+
+def wait_for_tokens(client, tokens, time_limit, on_done):
+    started = time.monotonic()
+
+    def on_callback(token, result_data):
+        on_done(token, dict(result_data, poll_count=0, wait_time=round(time.monotonic() - started, 3)))
+
+    arrived = wait_for_callbacks(tokens, settings.JUDGE_CALLBACK_TIMEOUT + time_limit, on_callback)
+    missing = [token for token in tokens if token not in arrived]
+    for chunk in _chunks(missing, JUDGE0_BATCH_SIZE):
+        wait_for_batch(client, chunk, time_limit, on_done)
+
+
+def run_batched(client, source_code, language_id, test_cases, limits, on_done):
+    tokens = []
+    for chunk in _chunks(test_cases, JUDGE0_BATCH_SIZE):
+        chunk_tokens = create_batch(client, source_code, language_id, chunk, limits)
+        if len(chunk_tokens) != len(chunk) or not all(chunk_tokens):
+            return False
+        tokens.extend(chunk_tokens)
+
+    indexes = {token: index for index, token in enumerate(tokens)}
+
+    def on_token_done(token, result_data):
+        on_done(indexes[token], result_data)
+
+    if callbacks_enabled():
+        wait_for_tokens(client, tokens, limits.wall_time, on_token_done)
+        return True
+
+    for chunk in _chunks(tokens, JUDGE0_BATCH_SIZE):
+        wait_for_batch(client, chunk, limits.wall_time, on_token_done)
+    return True
+
+
+def run_concurrent(client, source_code, language_id, test_cases, limits, on_done):
+    executor = get_executor()
+    futures = {
+        executor.submit(copy_context().run, run_single, client, source_code, language_id, test_case, limits): index
+        for index, test_case in enumerate(test_cases)
+    }
+
+    tokens = {}
+    failed = False
+    for future in as_completed(futures):
+        outcome = future.result()
+        if not outcome:
+            failed = True
+        elif isinstance(outcome, str):
+            tokens[outcome] = futures[future]
+        elif not failed:
+            on_done(futures[future], outcome)
+    if failed:
+        return False
+
+    if tokens:
+        wait_for_tokens(client, list(tokens), limits.wall_time,
+                        lambda token, result_data: on_done(tokens[token], result_data))
+    return True
+
+
+def _run_submission(client, data, time_limit, count):
+    if callbacks_enabled():
+        data["callback_url"] = callback_url()
+    params = {"base64_encoded": "false", "fields": JUDGE0_RESULT_FIELDS}
+    with timed("judge_judge0_create_seconds"):
+        response = client.post("/submissions", params=params, json=data)
+    token = response.json().get("token")
+    if not token:
+        return None
+
+    if callbacks_enabled():
+        finished = {}
+        wait_for_tokens(client, [token], time_limit * count, finished.__setitem__)
+        return finished[token]
+    return wait_for_single(client, token, PollBackoff(time_limit, count))
+
+
+def run_compiled_once(client, source_code, language_id, test_cases, limits, on_done):
+    offset = 0
+    while offset < len(test_cases):
+        group = test_cases[offset:]
+        data = {
+            "language_id": MULTI_FILE_LANGUAGE_ID,
+            "additional_files": build_additional_files(source_code, language_id, group, limits),
+            "cpu_time_limit": settings.JUDGE_MAX_CPU_TIME_LIMIT,
+            "wall_time_limit": settings.JUDGE_MAX_WALL_TIME_LIMIT,
+            "memory_limit": limits.memory_kb,
+        }
+        result_data = _run_submission(client, data, limits.wall_time, len(group))
+        if result_data is None:
+            return False
+
+        if is_compilation_error(result_data):
+            for position in range(len(group)):
+                on_done(offset + position, dict(result_data))
+            return True
+
+        per_test = split_results(result_data, limits.cpu_time)
+        reported = 0
+        while reported in per_test:
+            on_done(offset + reported, dict(per_test[reported], poll_count=result_data.get("poll_count"),
+                                            wait_time=result_data.get("wait_time")))
+            reported += 1
+
+        if reported == 0:
+            on_done(offset, dict(result_data, stdout=""))
+            reported = 1
+        offset += reported
+    return True
+
+
+EXECUTION_MODES = {
+    "batch": run_batched,
+    "concurrent": run_concurrent,
+}
+
+
+class Judge0Backend(ExecutionBackend):
+    def probe_first_test(self, language_id):
+        return not (settings.JUDGE_COMPILE_ONCE and supports_compile_once(language_id))
+
+    def run(self, source_code, language_id, test_cases, time_limit, memory_limit, on_done):
+        if settings.JUDGE_COMPILE_ONCE and supports_compile_once(language_id):
+            run = run_compiled_once
+        else:
+            run = EXECUTION_MODES[settings.JUDGE_EXECUTION_MODE]
+        limits = sandbox_limits(language_id, time_limit, memory_limit)
+        breaker = get_admission().breaker
+        breaker.acquire()
+        internal_errors = []
+
+        def on_judged(index, result_data):
+            if result_data.get("status", {}).get("id") == INTERNAL_ERROR_STATUS:
+                internal_errors.append(index)
+            on_done(index, result_data)
+
+        try:
+            with get_pool().acquire() as client:
+                succeeded = run(client, source_code, language_id, test_cases, limits, on_judged)
+        except requests.RequestException:
+            breaker.record(False)
+            raise
+        except Exception:
+            breaker.release()
+            raise
+        breaker.record(succeeded and not internal_errors)
+        return succeeded
@@ -0,0 +1,34 @@
+import math
+
+from django.conf import settings
+
+LANGUAGE_TIME_MULTIPLIERS = {
+    62: 2.0,
+    71: 3.0,
+}
+RUNTIME_ERROR_STATUSES = range(7, 13)
+MEMORY_KILL_RATIO = 0.95
+
+
+class SandboxLimits:
+    def __init__(self, cpu_time, wall_time, memory_kb):
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+        self.memory_kb = memory_kb
+
+    @property
+    def cpu_seconds(self):
+        return math.ceil(self.cpu_time)
+
+
+def sandbox_limits(language_id, time_limit, memory_limit):
+    cpu_time = min(time_limit * LANGUAGE_TIME_MULTIPLIERS.get(language_id, 1.0), settings.JUDGE_MAX_CPU_TIME_LIMIT)
+    wall_time = min(cpu_time * settings.JUDGE_WALL_TIME_FACTOR + settings.JUDGE_WALL_TIME_GRACE,
+                    settings.JUDGE_MAX_WALL_TIME_LIMIT)
+    memory_kb = min(max(memory_limit, settings.JUDGE_MIN_MEMORY_LIMIT), settings.JUDGE_MAX_MEMORY_LIMIT)
+    return SandboxLimits(cpu_time, wall_time, memory_kb)
+
+
+def memory_limit_exceeded(result_data, memory_limit):
+    status_id = result_data.get("status", {}).get("id")
+    return status_id in RUNTIME_ERROR_STATUSES and (result_data.get("memory") or 0) >= memory_limit * MEMORY_KILL_RATIO
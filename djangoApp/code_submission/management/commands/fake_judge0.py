@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from code_submission.fake_judge0 import FakeJudge0Config, FakeJudge0Server
+
+
+def add_fake_judge0_arguments(parser):
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--queue-delay', type=float, default=0.05, help="Seconds a submission stays In Queue")
+    parser.add_argument('--run-time', type=float, default=0.05, help="Seconds a submission stays Processing")
+    parser.add_argument('--workers', type=int, default=4, help="Submissions executed at the same time")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument('--compile-error-rate', type=float, default=0.0)
+    parser.add_argument('--time-limit-rate', type=float, default=0.0)
+
+
+def fake_judge0_config(options):
+    return FakeJudge0Config(
+        latency=options['latency'],
+        queue_delay=options['queue_delay'],
+        run_time=options['run_time'],
+        workers=options['workers'],
+        failure_rate=options['failure_rate'],
+        compile_error_rate=options['compile_error_rate'],
+        time_limit_rate=options['time_limit_rate'],
+    )
+
+
+class Command(BaseCommand):
+    help = "Runs a local Judge0 stand-in that echoes stdin as stdout"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=2358)
+        add_fake_judge0_arguments(parser)
+
+    def handle(self, *args, **options):
+        server = FakeJudge0Server(fake_judge0_config(options), host=options['host'], port=options['port'])
+        self.stdout.write(f"Fake Judge0 listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
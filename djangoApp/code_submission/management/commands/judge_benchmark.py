@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from code_submission.comparators import output_digest
+from code_submission.fake_judge0 import FakeJudge0Server
+from code_submission.judge0 import get_pool, reset_pool
+from code_submission.management.commands.fake_judge0 import add_fake_judge0_arguments, fake_judge0_config
+from problems.models import Problem, TestCase
+
+User = get_user_model()
+
+ENDPOINTS = {
+    'submit_code': '/api/code_submission/submit_code',
+    'test_code': '/api/code_submission/',
+    'verify_test_cases': '/api/code_submission/verify_test_cases',
+}
+SOURCE_CODE = "print(input())"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def judge0_request_counts():
+    return {node["url"]: sum(stats["count"] for stats in node["endpoints"].values()) for node in get_pool().stats()}
+
+
+class Command(BaseCommand):
+    help = "Drives the judge endpoints at a configurable concurrency and reports latency and Judge0 load"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', action='append', choices=list(ENDPOINTS),
+                            help="Endpoint to benchmark; repeat for several (default: all)")
+        parser.add_argument('--requests', type=int, default=50, help="Submissions per endpoint")
+        parser.add_argument('--concurrency', type=int, default=10, help="Simultaneous clients")
+        parser.add_argument('--test-cases', type=int, default=10, help="Test cases per submission")
+        parser.add_argument('--language-id', type=int, default=71)
+        parser.add_argument('--rate', type=float, default=0.0,
+                            help="Submissions per second to offer (default: closed loop)")
+        parser.add_argument('--allow-cache', action='store_true',
+                            help="Send byte-identical submissions so the result cache can serve them")
+        parser.add_argument('--fake', action='store_true', help="Run against an in-process fake Judge0")
+        parser.add_argument('--fake-nodes', type=int, default=1, help="Number of fake Judge0 nodes to start")
+        add_fake_judge0_arguments(parser)
+
+    def handle(self, *args, **options):
+        servers = []
+        if options['fake']:
+            servers = [FakeJudge0Server(fake_judge0_config(options)).start() for _ in range(options['fake_nodes'])]
+            os.environ["JUDGE_URLS"] = ",".join(server.url for server in servers)
+            reset_pool()
+            self.stdout.write(f"Fake Judge0 listening on {os.environ['JUDGE_URLS']}")
+        elif not (os.environ.get("JUDGE_URLS") or os.environ.get("JUDGE_URL")):
+            raise CommandError("JUDGE_URLS is not set; pass --fake to use the fake Judge0")
+
+        user, _ = User.objects.get_or_create(username='judge-benchmark', defaults={'role': 'student'})
+        problem = Problem.objects.create(
+            title='Judge benchmark',
+            description='Temporary problem created by judge_benchmark',
+            example_input='1',
+            example_output='1',
+            created_by=user,
+            solution_code=SOURCE_CODE,
+            memory_limit=262144,
+            time_limit=1,
+        )
+        TestCase.objects.bulk_create([
+            TestCase(problem=problem, stdin=f"{index}\n", expected_output=f"{index}\n",
+                     expected_digest=output_digest(f"{index}\n", problem.comparison_mode), is_sample=True)
+            for index in range(options['test_cases'])
+        ])
+        token = str(AccessToken.for_user(user))
+
+        failed = 0
+        try:
+            with override_settings(JUDGE_RATE_LIMIT_ENABLED=False):
+                for endpoint in options['endpoint'] or list(ENDPOINTS):
+                    failed += self.benchmark(endpoint, problem, token, options)
+        finally:
+            problem.delete()
+            for server in servers:
+                server.stop()
+        if failed:
+            raise CommandError(f"{failed} requests did not return 200; their latencies were not counted")
+
+    def payload(self, endpoint, problem, index, options):
+        source_code = SOURCE_CODE if options['allow_cache'] else f"{SOURCE_CODE}\n# {endpoint} {index} {time.time()}"
+        if endpoint == 'verify_test_cases':
+            return {
+                "source_code": source_code,
+                "language_id": options['language_id'],
+                "test_cases": [{"stdin": f"{i}\n", "expected_output": f"{i}\n"} for i in range(options['test_cases'])],
+                "memory_limit": problem.memory_limit,
+                "time_limit": problem.time_limit,
+            }
+        payload = {"source_code": source_code, "language_id": options['language_id'], "problem_id": problem.id}
+        if endpoint == 'test_code':
+            payload["mode"] = "samples"
+        return payload
+
+    def benchmark(self, endpoint, problem, token, options):
+        local = threading.local()
+        latencies = []
+        failures = Counter()
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def submit(index):
+            if options['rate']:
+                time.sleep(max(0.0, started + index / options['rate'] - time.monotonic()))
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Bearer {token}")
+            request_started = time.monotonic()
+            try:
+                response = local.client.post(ENDPOINTS[endpoint], self.payload(endpoint, problem, index, options),
+                                             content_type='application/json')
+            finally:
+                connections.close_all()
+            elapsed = time.monotonic() - request_started
+            with lock:
+                if response.status_code == 200:
+                    latencies.append(elapsed)
+                else:
+                    failures[response.status_code] += 1
+
+        judge0_before = judge0_request_counts()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(submit, range(options['requests'])))
+        wall_time = time.monotonic() - started
+        judge0_after = judge0_request_counts()
+        node_requests = {url: count - judge0_before.get(url, 0) for url, count in judge0_after.items()}
+        judge0_requests = sum(node_requests.values())
+
+        count = len(latencies)
+        failed = sum(failures.values())
+        summary = f"{endpoint}: {count} submissions x {options['test_cases']} tests, " \
+                  f"concurrency {options['concurrency']}, {failed} failed"
+        if failures:
+            summary += " (" + ", ".join(f"{status}: {n}" for status, n in sorted(failures.items())) + ")"
+        if not count:
+            self.stdout.write(summary)
+            return failed
+
+        self.stdout.write(
+            f"{summary}\n"
+            f"  latency p50 {percentile(latencies, 0.50) * 1000:.0f} ms, "
+            f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms\n"
+            f"  throughput {count / wall_time:.2f} submissions/s, "
+            f"Judge0 requests per submission {judge0_requests / count:.1f}\n"
+            f"  worker occupancy {sum(latencies) / (wall_time * options['concurrency']) * 100:.0f}%, "
+            f"worker-seconds per submission {sum(latencies) / count:.2f}"
+        )
+        if len(node_requests) > 1:
+            self.stdout.write("  Judge0 requests per node: " + ", ".join(
+                f"{url} {requests}" for url, requests in node_requests.items()))
+        return failed
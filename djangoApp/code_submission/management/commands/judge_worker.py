@@ -0,0 +1,51 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from code_submission.admission import get_admission
+from code_submission.generation import claim_generation_job, run_output_generation
+from code_submission.jobs import claim_job, run_job
+from code_submission.rejudge import claim_rejudge_job, run_rejudge
+
+
+class Command(BaseCommand):
+    help = "Claims pending submission, output generation and rejudge jobs and runs them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit when no job is pending")
+        parser.add_argument('--sleep', type=float, default=1.0, help="Seconds to wait when the queue is empty")
+
+    def handle(self, *args, **options):
+        worker_name = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Judge worker {worker_name} started")
+
+        while True:
+            get_admission().wait()
+            close_old_connections()
+            job = claim_job(worker_name)
+            if job is None:
+                generation_job = claim_generation_job(worker_name)
+                if generation_job is not None:
+                    self.stdout.write(f"Generating outputs for problem {generation_job.problem_id}")
+                    run_output_generation(generation_job)
+                    self.stdout.write(f"Generation job {generation_job.id} finished with status "
+                                      f"{generation_job.status}")
+                    continue
+                rejudge_job = claim_rejudge_job(worker_name)
+                if rejudge_job is not None:
+                    self.stdout.write(f"Rejudging problem {rejudge_job.problem_id} "
+                                      f"(job {rejudge_job.id}, from solution {rejudge_job.last_solution_id})")
+                    run_rejudge(rejudge_job)
+                    self.stdout.write(f"Rejudge job {rejudge_job.id} finished with status {rejudge_job.status}")
+                    continue
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Judging job {job.id} for problem {job.problem_id}")
+            run_job(job)
+            self.stdout.write(f"Job {job.id} finished with status {job.status}")
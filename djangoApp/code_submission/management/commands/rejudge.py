@@ -0,0 +1,57 @@
+import os
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from code_submission.models import RejudgeJob
+from code_submission.rejudge import claim_rejudge_job, queue_rejudge, run_rejudge, start_rejudge_job
+from problems.models import Problem
+
+
+class Command(BaseCommand):
+    help = "Rejudges stored solutions against new or changed test cases"
+
+    def add_arguments(self, parser):
+        parser.add_argument('problem_ids', nargs='*', type=int, help="Problems to rejudge now")
+        parser.add_argument('--pending', action='store_true', help="Process queued rejudge jobs until none is left")
+        parser.add_argument('--resume', type=int, metavar='JOB_ID', help="Continue an interrupted rejudge job")
+        parser.add_argument('--full', action='store_true', help="Rejudge every test case, not only stale ones")
+        parser.add_argument('--workers', type=int, default=settings.JUDGE_REJUDGE_WORKERS)
+        parser.add_argument('--rate', type=float, default=settings.JUDGE_REJUDGE_MAX_PER_MINUTE,
+                            help="Maximum solutions started per minute (0 for no limit)")
+
+    def handle(self, *args, **options):
+        worker_name = f"{socket.gethostname()}:{os.getpid()}"
+        jobs = []
+        if options['resume']:
+            try:
+                jobs.append(RejudgeJob.objects.get(id=options['resume']))
+            except RejudgeJob.DoesNotExist:
+                raise CommandError(f"Rejudge job {options['resume']} does not exist")
+        for problem_id in options['problem_ids']:
+            try:
+                problem = Problem.objects.get(id=problem_id)
+            except Problem.DoesNotExist:
+                raise CommandError(f"Problem {problem_id} does not exist")
+            jobs.append(queue_rejudge(problem, full=options['full']))
+        if not jobs and not options['pending']:
+            raise CommandError("Pass problem ids, --resume or --pending")
+
+        for job in jobs:
+            self.run(start_rejudge_job(job, worker_name), options)
+
+        while options['pending']:
+            close_old_connections()
+            job = claim_rejudge_job(worker_name)
+            if job is None:
+                break
+            self.run(job, options)
+
+    def run(self, job, options):
+        self.stdout.write(f"Rejudging problem {job.problem_id} (job {job.id}, from solution {job.last_solution_id})")
+        run_rejudge(job, workers=options['workers'], per_minute=options['rate'], on_progress=lambda progress: (
+            self.stdout.write(f"  {progress.completed_count}/{progress.total_count} solutions, "
+                              f"{progress.failed_count} failed")))
+        self.stdout.write(f"Job {job.id} finished with status {job.status}")
@@ -0,0 +1,241 @@
+import copy
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COMPARE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+POLL_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+HISTOGRAMS = {
+    "judge_db_load_seconds": ("Time spent loading the problem and its test cases.", LATENCY_BUCKETS),
+    "judge_judge0_create_seconds": ("Latency of Judge0 submission create requests.", LATENCY_BUCKETS),
+    "judge_queue_seconds": ("Time a test spent queued in the sandbox before running.", LATENCY_BUCKETS),
+    "judge_run_seconds": ("Wall time a test spent running in the sandbox.", LATENCY_BUCKETS),
+    "judge_poll_count": ("Status polls needed before a test finished.", POLL_BUCKETS),
+    "judge_compare_seconds": ("Time spent comparing a test's output with the expected output.", COMPARE_BUCKETS),
+    "judge_solution_write_seconds": ("Time spent writing the solution and its per-test results.", LATENCY_BUCKETS),
+}
+COUNTERS = {
+    "judge_result_cache_hits_total": "Test results served from the result cache.",
+    "judge_result_cache_misses_total": "Result cache lookups that had to be judged.",
+}
+FILE_PREFIX = "judge-metrics-"
+
+metric_labels = ContextVar("judge_metric_labels", default={})
+logger = logging.getLogger(__name__)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    def __init__(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._values = {}
+        self._dirty = False
+        self._pid = None
+        self._flusher = None
+
+    def _check_process(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._values = {}
+            self._flusher = None
+
+    def _entry(self, name, labels, empty):
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        self._check_process()
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = empty()
+        self._dirty = True
+        if self.directory and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="judge-metrics", daemon=True)
+            self._flusher.start()
+        return entry
+
+    def observe(self, name, value, **labels):
+        if value is None:
+            return
+        buckets = HISTOGRAMS[name][1]
+        with self._lock:
+            entry = self._entry(name, labels, lambda: {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0})
+            position = bisect_left(buckets, value)
+            if position < len(buckets):
+                entry["buckets"][position] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def increment(self, name, amount=1, **labels):
+        with self._lock:
+            entry = self._entry(name, labels, lambda: {"value": 0})
+            entry["value"] += amount
+
+    def _snapshot(self):
+        with self._lock:
+            self._check_process()
+            self._dirty = False
+            return [[name, list(labels), copy.deepcopy(entry)] for (name, labels), entry in self._values.items()]
+
+    def flush(self):
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{FILE_PREFIX}{os.getpid()}.json")
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w") as metrics_file:
+            json.dump(self._snapshot(), metrics_file)
+        os.replace(temporary_path, path)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError as e:
+                    logger.warning("Failed to write judge metrics: %s", e)
+
+    def collect(self):
+        if not self.directory:
+            return self._snapshot()
+        self.flush()
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, f"{FILE_PREFIX}*.json")):
+            pid = os.path.basename(path)[len(FILE_PREFIX):-len(".json")]
+            if pid.isdigit() and not _process_alive(int(pid)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as metrics_file:
+                    samples = json.load(metrics_file)
+            except (OSError, ValueError):
+                continue
+            for name, labels, entry in samples:
+                key = (name, tuple(tuple(label) for label in labels))
+                if name in COUNTERS:
+                    total = merged.setdefault(key, {"value": 0})
+                    total["value"] += entry["value"]
+                    continue
+                if name not in HISTOGRAMS:
+                    continue
+                total = merged.setdefault(key, {"buckets": [0] * len(HISTOGRAMS[name][1]), "sum": 0.0, "count": 0})
+                total["buckets"] = [a + b for a, b in zip(total["buckets"], entry["buckets"])]
+                total["sum"] += entry["sum"]
+                total["count"] += entry["count"]
+        return [[name, list(labels), entry] for (name, labels), entry in merged.items()]
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in pairs) + "}"
+
+
+def render(samples):
+    by_name = {}
+    for name, labels, entry in samples:
+        by_name.setdefault(name, []).append((labels, entry))
+
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, entry in sorted(by_name.get(name, []), key=lambda item: item[0]):
+            cumulative = 0
+            for bound, count in zip(buckets, entry["buckets"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', repr(float(bound))))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {entry['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {entry['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {entry['count']}")
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, entry in sorted(by_name.get(name, []), key=lambda item: item[0]):
+            lines.append(f"{name}{_format_labels(labels)} {entry['value']}")
+    return "\n".join(lines) + "\n"
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(settings.JUDGE_METRICS_DIR, settings.JUDGE_METRICS_FLUSH_INTERVAL)
+        return _registry
+
+
+def observe(name, value, language=None, problem=None, **labels):
+    context = metric_labels.get()
+    language = context.get("language") if language is None else language
+    problem = context.get("problem") if problem is None else problem
+    get_registry().observe(name, value, language=language or "", problem=problem or "", **labels)
+
+
+def increment(name, amount=1):
+    context = metric_labels.get()
+    get_registry().increment(name, amount, language=context.get("language") or "",
+                             problem=context.get("problem") or "")
+
+
+@contextmanager
+def labelled(language, problem):
+    token = metric_labels.set({"language": language, "problem": problem})
+    try:
+        yield
+    finally:
+        metric_labels.reset(token)
+
+
+@contextmanager
+def timed(name, language=None, problem=None, **labels):
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        observe(name, time.monotonic() - started, language, problem, **labels)
+
+
+def observe_sandbox_timings(result_data, language=None, problem=None):
+    wall_time = result_data.get("wall_time")
+    run_time = float(wall_time) if wall_time is not None else None
+    observe("judge_run_seconds", run_time, language, problem)
+
+    created_at = parse_datetime(result_data.get("created_at") or "")
+    finished_at = parse_datetime(result_data.get("finished_at") or "")
+    if created_at and finished_at:
+        observe("judge_queue_seconds", max(0.0, (finished_at - created_at).total_seconds() - (run_time or 0.0)),
+                language, problem)
+    if result_data.get("poll_count") is not None:
+        observe("judge_poll_count", result_data["poll_count"], language, problem)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_submission', '0011_ratelimitbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
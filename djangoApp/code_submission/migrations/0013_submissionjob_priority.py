@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_submission', '0012_idempotencykey_completed_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='submissionjob',
+            name='code_submis_status_aff05a_idx',
+        ),
+        migrations.AddField(
+            model_name='submissionjob',
+            name='priority',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='submissionjob',
+            index=models.Index(fields=['status', 'priority', 'created_at'], name='code_submis_status_5bc608_idx'),
+        ),
+    ]
@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.db import models
+
+from homeworks.models import Homework
+from problems.models import Problem
+
+
+class JudgeCallback(models.Model):
+    token = models.CharField(max_length=64, unique=True)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.token
+
+
+class SubmissionJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='submission_jobs')
+    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='submission_jobs')
+    homework = models.ForeignKey(Homework, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='submission_jobs')
+    source_code = models.TextField()
+    language_id = models.IntegerField()
+    status = models.CharField(choices=STATUS_CHOICES, max_length=10, default='PENDING')
+    priority = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    total_count = models.IntegerField(default=0)
+    results = models.JSONField(default=list)
+    percentage_passed = models.IntegerField(null=True, blank=True)
+    error = models.TextField(default='', blank=True)
+    worker = models.CharField(max_length=255, default='', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'priority', 'created_at'])]
+
+    def __str__(self):
+        return f"SubmissionJob {self.id} ({self.status})"
+
+
+class RejudgeJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='rejudge_jobs')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='rejudge_jobs')
+    full = models.BooleanField(default=False)
+    status = models.CharField(choices=STATUS_CHOICES, max_length=10, default='PENDING')
+    total_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    last_solution_id = models.IntegerField(default=0)
+    error = models.TextField(default='', blank=True)
+    worker = models.CharField(max_length=255, default='', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"RejudgeJob {self.id} for {self.problem.title} ({self.status})"
+
+
+class OutputGenerationJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='output_generation_jobs')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='output_generation_jobs')
+    overwrite = models.BooleanField(default=False)
+    apply_limits = models.BooleanField(default=False)
+    status = models.CharField(choices=STATUS_CHOICES, max_length=10, default='PENDING')
+    total_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    over_limit_count = models.IntegerField(default=0)
+    last_test_case_id = models.IntegerField(default=0)
+    suggested_time_limit = models.IntegerField(null=True, blank=True)
+    suggested_memory_limit = models.IntegerField(null=True, blank=True)
+    error = models.TextField(default='', blank=True)
+    worker = models.CharField(max_length=255, default='', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"OutputGenerationJob {self.id} for {self.problem.title} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    STATUS_CHOICES = (
+        ('IN_PROGRESS', 'In progress'),
+        ('DONE', 'Done'),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status = models.CharField(choices=STATUS_CHOICES, max_length=12, default='IN_PROGRESS')
+    response_status = models.IntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+        indexes = [models.Index(fields=['created_at'])]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.status})"
+
+
+class RateLimitBucket(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key} ({self.tokens:.1f})"
@@ -0,0 +1,125 @@
+import math
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from classes.models import Membership
+from .models import RateLimitBucket
+
+ACTION_RUN = "run"
+ACTION_SUBMIT = "submit"
+ACTION_VERIFY = "verify"
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, decision):
+        super().__init__("Too many judge requests, try again later")
+        self.decision = decision
+
+
+class Budget:
+    def __init__(self, key, capacity, per_minute):
+        self.key = key
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    @property
+    def window(self):
+        return math.ceil(self.capacity / self.rate)
+
+
+class RateLimitDecision:
+    def __init__(self, allowed, budget, tokens, cost):
+        self.allowed = allowed
+        self.budget = budget
+        self.tokens = tokens
+        self.cost = cost
+
+    @property
+    def retry_after(self):
+        if self.allowed:
+            return 0
+        return max(1, math.ceil((self.cost - self.tokens) / self.budget.rate))
+
+    def apply(self, response):
+        if self.budget is None:
+            return response
+        response["RateLimit-Limit"] = str(self.budget.capacity)
+        response["RateLimit-Remaining"] = str(max(0, math.floor(self.tokens)))
+        response["RateLimit-Reset"] = str(math.ceil((self.budget.capacity - self.tokens) / self.budget.rate))
+        response["RateLimit-Policy"] = f"{self.budget.capacity};w={self.budget.window}"
+        if not self.allowed:
+            response["Retry-After"] = str(self.retry_after)
+        return response
+
+
+def action_budgets(action):
+    capacity = getattr(settings, f"JUDGE_RATE_LIMIT_{action.upper()}_CAPACITY")
+    per_minute = getattr(settings, f"JUDGE_RATE_LIMIT_{action.upper()}_PER_MINUTE")
+    return capacity, per_minute
+
+
+def user_budgets(user, action, homework=None):
+    capacity, per_minute = action_budgets(action)
+    budgets = [Budget(f"user:{user.id}:{action}", capacity, per_minute)]
+
+    if homework is not None:
+        class_ids = [homework.class_instance_id]
+    else:
+        class_ids = Membership.objects.filter(student=user).values_list('class_instance_id', flat=True)
+    factor = settings.JUDGE_RATE_LIMIT_CLASS_FACTOR
+    for class_id in sorted(set(class_ids)):
+        budgets.append(Budget(f"class:{class_id}:{action}", int(capacity * factor), per_minute * factor))
+    return budgets
+
+
+def _ensure_buckets(budgets, now):
+    for budget in budgets:
+        if RateLimitBucket.objects.filter(key=budget.key).exists():
+            continue
+        try:
+            with transaction.atomic():
+                RateLimitBucket.objects.create(key=budget.key, tokens=budget.capacity, updated_at=now)
+        except IntegrityError:
+            pass
+
+
+def consume(budgets, cost):
+    _ensure_buckets(budgets, timezone.now())
+    by_key = {budget.key: budget for budget in budgets}
+
+    with transaction.atomic():
+        buckets = list(RateLimitBucket.objects.select_for_update().filter(key__in=by_key).order_by('key'))
+        now = timezone.now()
+        levels = []
+        for bucket in buckets:
+            budget = by_key[bucket.key]
+            elapsed = max(0.0, (now - bucket.updated_at).total_seconds())
+            tokens = min(budget.capacity, bucket.tokens + elapsed * budget.rate)
+            levels.append((bucket, budget, tokens, min(cost, budget.capacity)))
+
+        allowed = all(tokens >= charge for _, _, tokens, charge in levels)
+        for bucket, _, tokens, charge in levels:
+            bucket.tokens = tokens - charge if allowed else tokens
+            bucket.updated_at = now
+            bucket.save(update_fields=['tokens', 'updated_at'])
+
+    if allowed:
+        _, budget, tokens, charge = min(levels, key=lambda level: (level[2] - level[3]) / level[1].capacity)
+        return RateLimitDecision(True, budget, tokens - charge, charge)
+    _, budget, tokens, charge = max(levels, key=lambda level: (level[3] - level[2]) / level[1].rate)
+    return RateLimitDecision(False, budget, tokens, charge)
+
+
+def check_rate_limit(user, action, cost, homework=None):
+    if not settings.JUDGE_RATE_LIMIT_ENABLED:
+        return RateLimitDecision(True, None, 0, cost)
+    return consume(user_budgets(user, action, homework), max(1, cost))
+
+
+def enforce_rate_limit(user, action, cost, homework=None):
+    decision = check_rate_limit(user, action, cost, homework)
+    if not decision.allowed:
+        raise RateLimitExceeded(decision)
+    return decision
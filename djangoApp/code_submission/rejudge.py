@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from problems.models import TestCase
+from solutions.helpers import save_test_results
+from solutions.models import Solution, SolutionTestResult
+from .admission import get_admission
+from .helpers import POLICY_FULL, submit_and_test_code
+from .models import RejudgeJob
+from .scheduler import PRIORITY_REJUDGE
+
+
+class Throttle:
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def queue_rejudge(problem, requested_by=None, full=False):
+    job = RejudgeJob.objects.filter(problem=problem, full=full, status='PENDING').first()
+    if job is None:
+        job = RejudgeJob.objects.create(problem=problem, requested_by=requested_by, full=full)
+    return job
+
+
+def start_rejudge_job(job, worker_name):
+    now = timezone.now()
+    job.status = 'RUNNING'
+    job.worker = worker_name
+    job.started_at = job.started_at or now
+    job.heartbeat_at = now
+    job.save(update_fields=['status', 'worker', 'started_at', 'heartbeat_at'])
+    return job
+
+
+def claim_rejudge_job(worker_name):
+    stale_before = timezone.now() - timedelta(seconds=settings.JUDGE_JOB_STALE_AFTER)
+    with transaction.atomic():
+        job = (RejudgeJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(Q(status='PENDING') | Q(status='RUNNING', heartbeat_at__lt=stale_before))
+               .order_by('created_at')
+               .first())
+        if job is None:
+            return None
+        return start_rejudge_job(job, worker_name)
+
+
+def stale_test_cases(solution, test_cases, full=False):
+    if full:
+        return list(test_cases)
+    judged_at = dict(solution.test_results.values_list('test_case_id', 'judged_at'))
+    return [test_case for test_case in test_cases
+            if test_case.id not in judged_at or judged_at[test_case.id] < test_case.updated_at]
+
+
+def rejudge_solution(solution, problem, test_cases, full=False):
+    try:
+        stale = stale_test_cases(solution, test_cases, full)
+        if stale:
+            judged_at = timezone.now()
+            status, result_data = submit_and_test_code(solution.code, solution.language_id, stale,
+                                                       problem.memory_limit, problem.time_limit,
+                                                       policy=POLICY_FULL, priority=PRIORITY_REJUDGE,
+                                                       comparison_mode=problem.comparison_mode,
+                                                       epsilon=problem.comparison_epsilon, problem_id=problem.id)
+            if status != 200:
+                raise ValueError(result_data.get("error", "Judging failed"))
+
+            with transaction.atomic():
+                SolutionTestResult.objects.filter(solution=solution, test_case__in=stale).delete()
+                save_test_results(solution, result_data["results"], judged_at)
+
+        passed_count = solution.test_results.filter(passed=True).count()
+        percentage_passed = int((passed_count / len(test_cases)) * 100) if test_cases else 0
+        Solution.objects.filter(id=solution.id).update(percentage_passed=percentage_passed)
+        return len(stale)
+    finally:
+        connection.close()
+
+
+def run_rejudge(job, workers=None, per_minute=None, on_progress=None):
+    workers = workers or settings.JUDGE_REJUDGE_WORKERS
+    throttle = Throttle(settings.JUDGE_REJUDGE_MAX_PER_MINUTE if per_minute is None else per_minute)
+    problem = job.problem
+    test_cases = list(TestCase.objects.filter(problem=problem, output_pending=False))
+    solutions = Solution.objects.filter(problem=problem).order_by('id')
+    job.total_count = solutions.count()
+    job.save(update_fields=['total_count'])
+
+    def judge(solution):
+        get_admission().wait()
+        throttle.wait()
+        try:
+            rejudge_solution(solution, problem, test_cases, job.full)
+            return None
+        except Exception as e:
+            return f"Solution {solution.id}: {e}"
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rejudge") as executor:
+            while True:
+                batch = list(solutions.filter(id__gt=job.last_solution_id)[:workers * 4])
+                if not batch:
+                    break
+
+                errors = [error for error in executor.map(judge, batch) if error]
+                job.completed_count += len(batch)
+                job.failed_count += len(errors)
+                job.last_solution_id = batch[-1].id
+                job.heartbeat_at = timezone.now()
+                if errors:
+                    job.error = errors[-1]
+                job.save(update_fields=['completed_count', 'failed_count', 'last_solution_id', 'heartbeat_at',
+                                        'error'])
+                if on_progress:
+                    on_progress(job)
+
+        job.status = 'DONE'
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job
@@ -0,0 +1,224 @@
+import grp
+import os
+import pwd
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import as_completed
+
+from django.conf import settings
+
+from .backends import ExecutionBackend, get_executor
+from .limits import sandbox_limits
+
+LOCAL_LANGUAGES = {
+    50: {"source": "main.c", "compile": ["gcc", "-O2", "-o", "main", "main.c", "-lm"], "run": ["{workdir}/main"]},
+    54: {"source": "main.cpp", "compile": ["g++", "-O2", "-o", "main", "main.cpp"], "run": ["{workdir}/main"]},
+    71: {"source": "main.py", "compile": None, "run": ["python3", "{workdir}/main.py"]},
+}
+
+SIGNAL_STATUSES = {
+    signal.SIGSEGV: {"id": 7, "description": "Runtime Error (SIGSEGV)"},
+    signal.SIGXFSZ: {"id": 8, "description": "Runtime Error (SIGXFSZ)"},
+    signal.SIGFPE: {"id": 9, "description": "Runtime Error (SIGFPE)"},
+    signal.SIGABRT: {"id": 10, "description": "Runtime Error (SIGABRT)"},
+}
+ACCEPTED = {"id": 3, "description": "Accepted"}
+TIME_LIMIT_EXCEEDED = {"id": 5, "description": "Time Limit Exceeded"}
+COMPILATION_ERROR = {"id": 6, "description": "Compilation Error"}
+NON_ZERO_EXIT = {"id": 11, "description": "Runtime Error (NZEC)"}
+OTHER_ERROR = {"id": 12, "description": "Runtime Error (Other)"}
+INTERNAL_ERROR = {"id": 13, "description": "Internal Error"}
+INTERNAL_ERROR_RESULT = {"status": INTERNAL_ERROR, "stdout": None, "time": None, "memory": None, "stderr": None,
+                         "compile_output": None, "message": None}
+
+
+def _limited_command(command, cpu_seconds, memory_kb):
+    address_space = settings.JUDGE_LOCAL_ADDRESS_SPACE_MB * 1024 * 1024
+    limits = [
+        f"--cpu={cpu_seconds}:{cpu_seconds + 1}",
+        f"--as={address_space}:{address_space}",
+        f"--fsize={settings.JUDGE_LOCAL_MAX_OUTPUT_BYTES}:{settings.JUDGE_LOCAL_MAX_OUTPUT_BYTES}",
+        "--core=0:0",
+    ]
+    if memory_kb is not None:
+        limits.append(f"--data={memory_kb * 1024}:{memory_kb * 1024}")
+    if settings.JUDGE_LOCAL_USER:
+        limits.append(f"--nproc={settings.JUDGE_LOCAL_MAX_PROCESSES}:{settings.JUDGE_LOCAL_MAX_PROCESSES}")
+    return [settings.JUDGE_LOCAL_PRLIMIT, *limits, "--", *command]
+
+
+def _sandbox_owner():
+    if not settings.JUDGE_LOCAL_USER:
+        return None
+    user = pwd.getpwnam(settings.JUDGE_LOCAL_USER)
+    gid = grp.getgrnam(settings.JUDGE_LOCAL_GROUP).gr_gid if settings.JUDGE_LOCAL_GROUP else user.pw_gid
+    return user.pw_uid, gid
+
+
+def _hand_over(path):
+    owner = _sandbox_owner()
+    if owner is not None:
+        os.chown(path, *owner)
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _watchdog_kill(pid, fired):
+    fired.set()
+    _kill_group(pid)
+
+
+def _read_stream(stream, limit, output, name):
+    data = stream.read(limit)
+    while stream.read(65536):
+        pass
+    output[name] = data.decode("utf-8", errors="replace")
+
+
+def _write_stream(stream, data):
+    try:
+        stream.write(data)
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+def _sandbox_env(cwd):
+    return {"PATH": settings.JUDGE_LOCAL_PATH, "LANG": "C.UTF-8", "HOME": cwd, "TMPDIR": cwd}
+
+
+def execute(command, cwd, stdin, cpu_seconds, wall_seconds, memory_kb=None):
+    owner = _sandbox_owner()
+    process = subprocess.Popen(
+        _limited_command(command, cpu_seconds, memory_kb),
+        cwd=cwd,
+        env=_sandbox_env(cwd),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        process_group=0,
+        user=owner[0] if owner else None,
+        group=owner[1] if owner else None,
+        extra_groups=[] if owner else None,
+    )
+    fired = threading.Event()
+    watchdog = threading.Timer(wall_seconds, _watchdog_kill, [process.pid, fired])
+    watchdog.start()
+
+    output = {}
+    threads = [
+        threading.Thread(target=_write_stream, args=(process.stdin, stdin.encode("utf-8"))),
+        threading.Thread(target=_read_stream,
+                         args=(process.stdout, settings.JUDGE_LOCAL_MAX_OUTPUT_BYTES, output, "stdout")),
+        threading.Thread(target=_read_stream,
+                         args=(process.stderr, settings.JUDGE_LOCAL_MAX_OUTPUT_BYTES, output, "stderr")),
+    ]
+    for thread in threads:
+        thread.start()
+
+    started = time.monotonic()
+    _, wait_status, usage = os.wait4(process.pid, 0)
+    wall_time = time.monotonic() - started
+    watchdog.cancel()
+    process.returncode = os.waitstatus_to_exitcode(wait_status)
+
+    _kill_group(process.pid)
+    for thread in threads:
+        thread.join()
+
+    return {
+        "returncode": process.returncode,
+        "stdout": output.get("stdout", ""),
+        "stderr": output.get("stderr", ""),
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "wall_time": wall_time,
+        "memory": usage.ru_maxrss,
+        "timed_out": fired.is_set(),
+    }
+
+
+def _status(execution, cpu_time):
+    returncode = execution["returncode"]
+    if execution["timed_out"] or returncode == -signal.SIGXCPU or execution["cpu_time"] > cpu_time:
+        return TIME_LIMIT_EXCEEDED
+    if returncode < 0:
+        return SIGNAL_STATUSES.get(-returncode, OTHER_ERROR)
+    if returncode > 0:
+        return NON_ZERO_EXIT
+    return ACCEPTED
+
+
+def compile_source(language, workdir):
+    if language["compile"] is None:
+        return None
+    execution = execute(language["compile"], workdir, "", settings.JUDGE_LOCAL_COMPILE_TIMEOUT,
+                        settings.JUDGE_LOCAL_COMPILE_TIMEOUT)
+    if execution["returncode"] == 0:
+        return None
+    return {"status": COMPILATION_ERROR, "stdout": None, "time": None, "memory": None, "stderr": None,
+            "compile_output": execution["stdout"] + execution["stderr"], "message": None}
+
+
+def run_test(language, workdir, test_case, limits):
+    started = time.monotonic()
+    command = [part.format(workdir=workdir) for part in language["run"]]
+    with tempfile.TemporaryDirectory(dir=workdir) as test_dir:
+        _hand_over(test_dir)
+        execution = execute(command, test_dir, test_case.stdin, limits.cpu_seconds, limits.wall_time,
+                            limits.memory_kb)
+    return {
+        "status": _status(execution, limits.cpu_time),
+        "stdout": execution["stdout"],
+        "time": f"{execution['cpu_time']:.3f}",
+        "wall_time": f"{execution['wall_time']:.3f}",
+        "memory": execution["memory"],
+        "stderr": execution["stderr"],
+        "compile_output": None,
+        "message": None,
+        "poll_count": 0,
+        "wait_time": round(time.monotonic() - started, 3),
+    }
+
+
+class LocalBackend(ExecutionBackend):
+    def probe_first_test(self, language_id):
+        return False
+
+    def run(self, source_code, language_id, test_cases, time_limit, memory_limit, on_done):
+        language = LOCAL_LANGUAGES.get(language_id)
+        if language is None:
+            for index in range(len(test_cases)):
+                on_done(index, dict(INTERNAL_ERROR_RESULT, message=f"Language {language_id} is not supported"))
+            return True
+
+        with tempfile.TemporaryDirectory(prefix="judge-") as workdir:
+            _hand_over(workdir)
+            with open(os.path.join(workdir, language["source"]), "w") as source_file:
+                source_file.write(source_code)
+
+            compile_error = compile_source(language, workdir)
+            if compile_error is not None:
+                for index in range(len(test_cases)):
+                    on_done(index, dict(compile_error))
+                return True
+
+            limits = sandbox_limits(language_id, time_limit, memory_limit)
+            futures = {
+                get_executor().submit(run_test, language, workdir, test_case, limits): index
+                for index, test_case in enumerate(test_cases)
+            }
+            for future in as_completed(futures):
+                on_done(futures[future], future.result())
+        return True
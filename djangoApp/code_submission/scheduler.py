@@ -0,0 +1,146 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+PRIORITY_DEADLINE = "deadline"
+PRIORITY_GRADED = "graded"
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_VERIFY = "verify"
+PRIORITY_REJUDGE = "rejudge"
+PRIORITY_RANKS = {PRIORITY_DEADLINE: 4, PRIORITY_GRADED: 3, PRIORITY_INTERACTIVE: 2, PRIORITY_VERIFY: 1,
+                  PRIORITY_REJUDGE: 0}
+STATS_TEMPLATE = {"queued": 0, "running": 0, "dispatched": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+
+def submission_priority(homework):
+    if homework is None:
+        return PRIORITY_GRADED
+    now = timezone.now()
+    if now <= homework.due_date <= now + timedelta(seconds=settings.JUDGE_DEADLINE_WINDOW):
+        return PRIORITY_DEADLINE
+    return PRIORITY_GRADED
+
+
+class _Ticket:
+    def __init__(self, priority, cost, flow_tag):
+        self.priority = priority
+        self.cost = max(cost, 1)
+        self.flow_tag = flow_tag
+        self.enqueued_at = time.monotonic()
+        self.ready = threading.Event()
+
+
+class JudgeScheduler:
+    def __init__(self, slots, weights):
+        self.slots = slots
+        self.weights = weights
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._flow_tags = {}
+        self._class_tags = {}
+        self._class_virtual_times = {}
+        self._virtual_time = 0.0
+        self._running = 0
+        self._stats = {priority: dict(STATS_TEMPLATE) for priority in weights}
+
+    def _weight(self, priority):
+        return self.weights.get(priority, 1.0)
+
+    def _flow_tag(self, priority, flow, cost):
+        key = (priority, flow)
+        finish_tag = max(self._class_virtual_times.get(priority, 0.0), self._flow_tags.get(key, 0.0)) + max(cost, 1)
+        self._flow_tags[key] = finish_tag
+        return finish_tag
+
+    def _class_start(self, priority):
+        return max(self._virtual_time, self._class_tags.get(priority, 0.0))
+
+    def _class_finish(self, ticket):
+        return self._class_start(ticket.priority) + ticket.cost / self._weight(ticket.priority)
+
+    def _dispatch(self, ticket):
+        wait = time.monotonic() - ticket.enqueued_at
+        stats = self._stats.setdefault(ticket.priority, dict(STATS_TEMPLATE))
+        stats["running"] += 1
+        stats["dispatched"] += 1
+        stats["total_wait_seconds"] += wait
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+        start_tag = self._class_start(ticket.priority)
+        self._class_tags[ticket.priority] = self._class_finish(ticket)
+        self._virtual_time = start_tag
+        self._class_virtual_times[ticket.priority] = max(self._class_virtual_times.get(ticket.priority, 0.0),
+                                                         ticket.flow_tag - ticket.cost)
+        self._running += 1
+        ticket.ready.set()
+
+    def _next(self):
+        heads = [queue[0][2] for queue in self._queues.values() if queue]
+        ticket = min(heads, key=lambda head: (self._class_finish(head), -self._weight(head.priority)))
+        heapq.heappop(self._queues[ticket.priority])
+        self._queued -= 1
+        return ticket
+
+    def _acquire(self, priority, flow, cost):
+        with self._lock:
+            ticket = _Ticket(priority, cost, self._flow_tag(priority, flow, cost))
+            if self._running < self.slots and not self._queued:
+                self._dispatch(ticket)
+            else:
+                self._stats.setdefault(priority, dict(STATS_TEMPLATE))["queued"] += 1
+                heapq.heappush(self._queues.setdefault(priority, []), (ticket.flow_tag, next(self._sequence), ticket))
+                self._queued += 1
+        ticket.ready.wait()
+        return ticket
+
+    def _release(self, ticket):
+        with self._lock:
+            self._running -= 1
+            self._stats[ticket.priority]["running"] -= 1
+            while self._queued and self._running < self.slots:
+                queued = self._next()
+                self._stats[queued.priority]["queued"] -= 1
+                self._dispatch(queued)
+            if len(self._flow_tags) > 1024:
+                self._flow_tags = {
+                    (priority, flow): finish_tag for (priority, flow), finish_tag in self._flow_tags.items()
+                    if finish_tag > self._class_virtual_times.get(priority, 0.0)
+                }
+
+    @contextmanager
+    def slot(self, priority, flow, cost):
+        if self.slots <= 0:
+            yield
+            return
+        ticket = self._acquire(priority, flow, cost)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def stats(self):
+        with self._lock:
+            return {
+                priority: dict(stats, weight=self._weight(priority), avg_wait_seconds=(
+                    stats["total_wait_seconds"] / stats["dispatched"] if stats["dispatched"] else 0.0))
+                for priority, stats in self._stats.items()
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JudgeScheduler(settings.JUDGE_SCHEDULER_SLOTS, settings.JUDGE_PRIORITY_WEIGHTS)
+        return _scheduler
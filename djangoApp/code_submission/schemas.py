@@ -1,6 +1,8 @@
+from datetime import datetime
 from typing import List, Optional
 
 from ninja import Schema
+from pydantic import field_validator
 
 
 class CodeSubmissionSchema(Schema):
@@ -10,24 +12,67 @@ class CodeSubmissionSchema(Schema):
     homework_id: Optional[int] = None
 
 
+class RunCodeSchema(CodeSubmissionSchema):
+    mode: str = 'samples'
+    stdin: Optional[str] = None
+
+    @field_validator('mode')
+    def validate_mode(cls, value):
+        valid_modes = ['samples', 'custom']
+        if value not in valid_modes:
+            raise ValueError(f'mode must be one of {valid_modes}')
+        return value
+
+
 class TestCaseResultSchema(Schema):
     test_case_id: int
     input: str
-    expected_output: str
+    expected_output: Optional[str] = None
     actual_output: str
     status: str
-    passed: bool
+    passed: Optional[bool] = None
     memory_exceeded: bool
     time_exceeded: bool
     compile_output: Optional[str] = None
     stderr: Optional[str] = None
     message: Optional[str] = None
+    poll_count: Optional[int] = None
+    wait_time: Optional[float] = None
+    cached: bool = False
+    skipped: bool = False
 
 
 class CodeSubmissionResultSchema(Schema):
     results: List[TestCaseResultSchema]
 
 
+class OutputPreviewSchema(Schema):
+    head: str
+    tail: str
+    bytes: int
+    truncated: bool
+
+
+class CompactTestCaseResultSchema(Schema):
+    test_case_id: int
+    status: str
+    passed: Optional[bool] = None
+    verdict: int
+    time_ms: Optional[int] = None
+    memory_kb: Optional[int] = None
+    skipped: bool = False
+    actual_output: OutputPreviewSchema
+    stderr: OutputPreviewSchema
+    compile_output: OutputPreviewSchema
+
+
+class CompactCodeSubmissionResultSchema(Schema):
+    solution_id: Optional[int] = None
+    passed_count: int
+    total_count: int
+    results: List[CompactTestCaseResultSchema]
+
+
 class TestCaseVerifySchema(Schema):
     id: int = 0
     stdin: str
@@ -40,6 +85,15 @@ class VerifyCodeSubmissionSchema(Schema):
     test_cases: List[TestCaseVerifySchema]
     memory_limit: int
     time_limit: int
+    comparison_mode: str = 'exact'
+    comparison_epsilon: float = 1e-6
+
+    @field_validator('comparison_mode')
+    def validate_comparison_mode(cls, value):
+        valid_modes = ['exact', 'tokens', 'lines', 'numeric']
+        if value not in valid_modes:
+            raise ValueError(f'comparison_mode must be one of {valid_modes}')
+        return value
 
 
 class TestCaseVerifyResultSchema(Schema):
@@ -51,7 +105,36 @@ class TestCaseVerifyResultSchema(Schema):
     passed: bool
     memory_exceeded: bool
     time_exceeded: bool
+    poll_count: Optional[int] = None
+    wait_time: Optional[float] = None
+    cached: bool = False
+    skipped: bool = False
 
 
 class VerifyCodeSubmissionResultSchema(Schema):
     results: List[TestCaseVerifyResultSchema]
+
+
+class SubmissionJobCreatedSchema(Schema):
+    id: int
+    status: str
+
+
+class SubmissionJobSchema(Schema):
+    id: int
+    problem_id: int
+    homework_id: Optional[int] = None
+    status: str
+    completed_count: int
+    total_count: int
+    percentage_passed: Optional[int] = None
+    results: List[TestCaseResultSchema]
+    error: str
+    created_at: str
+    finished_at: Optional[str] = None
+
+    @field_validator('created_at', 'finished_at', mode='before')
+    def format_datetime(cls, value: datetime) -> str:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
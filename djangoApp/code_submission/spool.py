@@ -0,0 +1,30 @@
+import json
+import tempfile
+import threading
+
+from solutions.helpers import stored_output
+
+
+class OutputSpool:
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def write(self, index, outputs):
+        data = json.dumps({field: stored_output(text) for field, text in outputs.items()}).encode("utf-8")
+        with self._lock:
+            self._file.seek(0, 2)
+            self._positions[index] = (self._file.tell(), len(data))
+            self._file.write(data)
+
+    def read(self, index):
+        with self._lock:
+            if index not in self._positions:
+                return {}
+            offset, size = self._positions[index]
+            self._file.seek(offset)
+            return json.loads(self._file.read(size))
+
+    def close(self):
+        self._file.close()
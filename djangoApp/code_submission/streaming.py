@@ -0,0 +1,72 @@
+import json
+import queue
+import threading
+
+import requests
+from django.db import connection
+from django.http import StreamingHttpResponse
+
+from .admission import JudgeUnavailable, judge_unreachable
+from .helpers import preview_result
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request):
+    return NDJSON_CONTENT_TYPE in request.headers.get("Accept", "")
+
+
+def _line(data):
+    return json.dumps(data) + "\n"
+
+
+def stream_results(judge, on_summary=None):
+    pending = queue.Queue()
+    finished = object()
+    outcome = {}
+
+    def summarize(result_data):
+        passed_count = result_data["passed_count"]
+        total_count = result_data["total_count"]
+        percentage_passed = int((passed_count / total_count) * 100) if total_count else 0
+        if on_summary:
+            on_summary(percentage_passed, result_data["results"], result_data.get("outputs"))
+        return {"type": "summary", "passed_count": passed_count, "total_count": total_count,
+                "percentage_passed": percentage_passed}
+
+    def worker():
+        result_data = {}
+        try:
+            status, result_data = judge(pending.put)
+            outcome["response"] = (status, summarize(result_data) if status == 200 else result_data)
+        except requests.RequestException:
+            outcome["response"] = (503, {"error": str(judge_unreachable())})
+        except JudgeUnavailable as e:
+            outcome["response"] = (503, {"error": str(e)})
+        except Exception as e:
+            outcome["response"] = (400, {"error": str(e)})
+        finally:
+            if result_data.get("outputs") is not None:
+                result_data["outputs"].close()
+            connection.close()
+            pending.put(finished)
+
+    threading.Thread(target=worker, name="judge-stream", daemon=True).start()
+
+    def lines():
+        while True:
+            result = pending.get()
+            if result is finished:
+                break
+            yield _line(dict(preview_result(result), type="result"))
+
+        status, result_data = outcome["response"]
+        if status != 200:
+            yield _line({"type": "error", "error": result_data.get("error", "Judging failed")})
+            return
+        yield _line(result_data)
+
+    response = StreamingHttpResponse(lines(), content_type=NDJSON_CONTENT_TYPE)
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
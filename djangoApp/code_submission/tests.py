@@ -1,2 +1,554 @@
-from django.test import TestCase
+import os
+import shutil
+import threading
+import time
+import unittest
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from problems.models import Problem, TestCase as ProblemTestCase
+from solutions.models import Solution, SolutionTestResult
+from . import cache as cache_module
+from .admission import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, JudgeUnavailable
+from .backends import ExecutionBackend, get_backend_by_name
+from .cache import ResultCache
+from .callbacks import record_callback
+from .comparators import MODE_EXACT, MODE_LINES, MODE_NUMERIC, MODE_TOKENS, output_digest, outputs_match
+from .dedup import SingleFlight, deduplicate
+from .helpers import POLICY_FIRST_FAILURE, POLICY_FULL, submit_and_test_code
+from .models import IdempotencyKey, JudgeCallback, RejudgeJob
+from .ratelimit import Budget, consume
+from .rejudge import run_rejudge, stale_test_cases
+from .scheduler import JudgeScheduler
+
+User = get_user_model()
+
+PYTHON = 71
+CPP = 54
+
+ACCEPTED = 3
+TIME_LIMIT_EXCEEDED = 5
+COMPILATION_ERROR = 6
+RUNTIME_ERRORS = range(7, 13)
+
+
+def make_test_cases(*stdins):
+    return [SimpleNamespace(id=index, stdin=stdin, expected_output="") for index, stdin in enumerate(stdins)]
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition was not reached in time")
+        time.sleep(0.01)
+
+
+class EchoBackend(ExecutionBackend):
+    runs = []
+
+    def run(self, source_code, language_id, test_cases, time_limit, memory_limit, on_done):
+        EchoBackend.runs.append([test_case.id for test_case in test_cases])
+        for index, test_case in enumerate(test_cases):
+            on_done(index, {"status": {"id": ACCEPTED, "description": "Accepted"}, "stdout": test_case.stdin,
+                            "stderr": "", "compile_output": None, "message": None, "time": "0.010", "memory": 1024})
+        return True
+
+
+echo_backend = override_settings(JUDGE_BACKEND_CLASSES={"echo": "code_submission.tests.EchoBackend"},
+                                 JUDGE_DEFAULT_BACKEND="echo", JUDGE_LANGUAGE_BACKENDS={})
+
+
+class ExecutionBackendConformance:
+    backend_name = None
+
+    def run_backend(self, source_code, language_id, test_cases, time_limit=1, memory_limit=262144):
+        backend = get_backend_by_name(self.backend_name)
+        results = {}
+
+        def on_done(index, result_data):
+            self.assertNotIn(index, results)
+            results[index] = result_data
+
+        self.assertTrue(backend.run(source_code, language_id, test_cases, time_limit, memory_limit, on_done))
+        self.assertEqual(sorted(results), list(range(len(test_cases))))
+        return [results[index] for index in range(len(test_cases))]
+
+    def test_echoes_stdout_in_test_case_order(self):
+        test_cases = make_test_cases("1\n", "2\n", "3\n")
+        results = self.run_backend("print(int(input()) * 2)", PYTHON, test_cases)
+
+        self.assertEqual([result["status"]["id"] for result in results], [ACCEPTED] * 3)
+        self.assertEqual([result["stdout"].strip() for result in results], ["2", "4", "6"])
+
+    def test_reports_time_and_memory(self):
+        result = self.run_backend("print('ok')", PYTHON, make_test_cases(""))[0]
+
+        self.assertGreaterEqual(float(result["time"]), 0)
+        self.assertGreater(result["memory"], 0)
+
+    def test_non_zero_exit_is_runtime_error(self):
+        result = self.run_backend("import sys\nsys.exit(3)", PYTHON, make_test_cases(""))[0]
+
+        self.assertIn(result["status"]["id"], RUNTIME_ERRORS)
+
+    def test_captures_stderr(self):
+        result = self.run_backend("import sys\nsys.stderr.write('boom')", PYTHON, make_test_cases(""))[0]
+
+        self.assertIn("boom", result["stderr"])
+
+    def test_infinite_loop_is_time_limit_exceeded(self):
+        result = self.run_backend("while True:\n    pass", PYTHON, make_test_cases(""))[0]
+
+        self.assertEqual(result["status"]["id"], TIME_LIMIT_EXCEEDED)
+
+    def test_compiled_language_runs_every_test(self):
+        source_code = "#include <iostream>\nint main() { long long x; std::cin >> x; std::cout << x + 1; }"
+        results = self.run_backend(source_code, CPP, make_test_cases("1", "41"))
+
+        self.assertEqual([result["stdout"].strip() for result in results], ["2", "42"])
+
+    def test_compilation_error_is_reported_for_every_test(self):
+        results = self.run_backend("int main() { return }", CPP, make_test_cases("", ""))
+
+        for result in results:
+            self.assertEqual(result["status"]["id"], COMPILATION_ERROR)
+            self.assertTrue(result["compile_output"])
+
+
+@unittest.skipUnless(shutil.which("python3") and shutil.which("g++"), "python3 and g++ are required")
+class LocalBackendConformanceTests(ExecutionBackendConformance, SimpleTestCase):
+    backend_name = "local"
+
+
+@unittest.skipUnless(os.environ.get("JUDGE0_CONFORMANCE"), "set JUDGE0_CONFORMANCE to run against JUDGE_URL")
+class Judge0BackendConformanceTests(ExecutionBackendConformance, SimpleTestCase):
+    backend_name = "judge0"
+
+
+class OutputDigestAgreementTests(SimpleTestCase):
+    def assert_agrees(self, actual, expected, mode, matches, epsilon=1e-6):
+        digest = output_digest(expected, mode)
+        self.assertEqual(outputs_match(actual, expected, mode, epsilon), matches)
+        self.assertEqual(outputs_match(actual, expected, mode, epsilon, expected_digest=digest), matches)
+        if mode != MODE_NUMERIC:
+            self.assertEqual(output_digest(actual, mode) == digest, matches)
+
+    def test_exact(self):
+        self.assert_agrees("1 2\n3\n", "1 2\n3\n", MODE_EXACT, True)
+        self.assert_agrees("1 2\n3   \n\n", "1 2\n3", MODE_EXACT, True)
+        self.assert_agrees("  1 2\n3", "1 2\n3", MODE_EXACT, True)
+        self.assert_agrees("1 2 \n3", "1 2\n3", MODE_EXACT, False)
+        self.assert_agrees("1  2\n3", "1 2\n3", MODE_EXACT, False)
+        self.assert_agrees("1 2\n4", "1 2\n3", MODE_EXACT, False)
+
+    def test_lines(self):
+        self.assert_agrees("a b\nc\n", "a b\nc", MODE_LINES, True)
+        self.assert_agrees("a b  \nc\t\n\n\n", "a b\nc", MODE_LINES, True)
+        self.assert_agrees("a b\r\nc\r\n", "a b\nc\n", MODE_LINES, True)
+        self.assert_agrees("a b\n\nc", "a b\nc", MODE_LINES, False)
+        self.assert_agrees("\na b\nc", "a b\nc", MODE_LINES, False)
+        self.assert_agrees(" a b\nc", "a b\nc", MODE_LINES, False)
+        self.assert_agrees("a  b\nc", "a b\nc", MODE_LINES, False)
+        self.assert_agrees("a b c", "a b\nc", MODE_LINES, False)
+
+    def test_tokens(self):
+        self.assert_agrees("1 2 3", "1\n2\n3\n", MODE_TOKENS, True)
+        self.assert_agrees("  1\t2   3 \n\n", "1 2 3", MODE_TOKENS, True)
+        self.assert_agrees("12 3", "1 2 3", MODE_TOKENS, False)
+        self.assert_agrees("1 2", "1 2 3", MODE_TOKENS, False)
+        self.assert_agrees("1 2 3 4", "1 2 3", MODE_TOKENS, False)
+
+    def test_numeric(self):
+        self.assert_agrees("0.5 2\n", "0.5 2", MODE_NUMERIC, True)
+        self.assert_agrees("0.5000001 2", "0.5 2", MODE_NUMERIC, True)
+        self.assert_agrees("1000000.5 2", "1000000 2", MODE_NUMERIC, True)
+        self.assert_agrees("0.50001 2", "0.5 2", MODE_NUMERIC, False)
+        self.assert_agrees("0.5 2 3", "0.5 2", MODE_NUMERIC, False)
+        self.assert_agrees("nan", "0.5", MODE_NUMERIC, False)
+        self.assert_agrees("inf yes", "inf yes", MODE_NUMERIC, True)
+        self.assert_agrees("0.51", "0.5", MODE_NUMERIC, True, epsilon=0.1)
+        self.assert_agrees("0.5 no", "0.5 yes", MODE_NUMERIC, False, epsilon=0.1)
+
+    def test_digest_of_other_mode_is_ignored(self):
+        self.assertTrue(outputs_match("1 2", "1\n2", MODE_TOKENS, expected_digest=output_digest("1\n2", MODE_EXACT)))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("code_submission.admission.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, error_rate=1.0, window=10, reset_timeout=30)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.acquire()
+            self.breaker.record(False)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record(False)
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(JudgeUnavailable) as raised:
+            self.breaker.acquire()
+        self.assertEqual(raised.exception.retry_after, 30)
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record(False)
+        self.breaker.record(False)
+        self.breaker.record(True)
+        self.breaker.record(False)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        self.open_breaker()
+        self.now += 30
+
+        self.breaker.acquire()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertEqual(self.breaker.allow(), (False, 30))
+        with self.assertRaises(JudgeUnavailable):
+            self.breaker.acquire()
+
+    def test_successful_probe_closes_and_failed_probe_reopens(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.acquire()
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.open_breaker()
+        self.now += 30
+        self.breaker.acquire()
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_released_probe_can_be_claimed_again(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.acquire()
+        self.breaker.release()
+
+        self.breaker.acquire()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        patcher = mock.patch("code_submission.ratelimit.timezone.now", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_consumes_and_refills(self):
+        budget = Budget("user:1:run", 10, 60)
+
+        self.assertTrue(consume([budget], 6).allowed)
+        denied = consume([budget], 6)
+        self.assertFalse(denied.allowed)
+        self.assertEqual(denied.retry_after, 2)
+
+        self.now += timedelta(seconds=2)
+        allowed = consume([budget], 6)
+        self.assertTrue(allowed.allowed)
+        self.assertAlmostEqual(allowed.tokens, 0)
+
+    def test_refill_is_capped_at_capacity(self):
+        budget = Budget("user:1:submit", 10, 60)
+        consume([budget], 10)
+
+        self.now += timedelta(hours=1)
+        self.assertTrue(consume([budget], 10).allowed)
+        self.assertFalse(consume([budget], 1).allowed)
+
+    def test_oversized_requests_drain_a_full_bucket(self):
+        budget = Budget("user:1:verify", 10, 60)
+
+        self.assertTrue(consume([budget], 25).allowed)
+        self.assertFalse(consume([budget], 1).allowed)
+
+    def test_denied_request_charges_no_bucket(self):
+        user_budget = Budget("user:1:run", 10, 60)
+        class_budget = Budget("class:1:run", 4, 60)
+        consume([user_budget, class_budget], 4)
+
+        self.assertFalse(consume([user_budget, class_budget], 2).allowed)
+        self.assertTrue(consume([user_budget], 6).allowed)
+        self.assertFalse(consume([user_budget], 1).allowed)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def call():
+            calls.append(1)
+            release.wait()
+            return "done"
+
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", call)))
+        leader.start()
+        wait_until(lambda: flight.in_flight("key"))
+        follower = threading.Thread(target=lambda: results.append(flight.do("key", call)))
+        follower.start()
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["done", "done"])
+        self.assertFalse(flight.in_flight("key"))
+
+
+class DeduplicateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="student", role="student")
+        self.calls = []
+
+    def request(self, idempotency_key=None):
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+        return SimpleNamespace(auth=self.user, headers=headers)
+
+    def handler(self, status=200):
+        def handle():
+            self.calls.append(status)
+            return status, {"call": len(self.calls)}
+
+        return handle
+
+    def test_replays_the_stored_response_for_a_reused_key(self):
+        payload = {"problem_id": 1, "source_code": "print(1)"}
+
+        first = deduplicate(self.request("key"), "submit_code", payload, self.handler())
+        second = deduplicate(self.request("key"), "submit_code", payload, self.handler())
+
+        self.assertEqual(first, (200, {"call": 1}))
+        self.assertEqual(second, (200, {"call": 1}))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_rejects_a_key_reused_for_another_request(self):
+        deduplicate(self.request("key"), "submit_code", {"source_code": "print(1)"}, self.handler())
+        status, _ = deduplicate(self.request("key"), "submit_code", {"source_code": "print(2)"}, self.handler())
+
+        self.assertEqual(status, 422)
+
+    def test_failed_judging_is_not_replayed(self):
+        payload = {"source_code": "print(1)"}
+
+        self.assertEqual(deduplicate(self.request("key"), "submit_code", payload, self.handler(400))[0], 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(deduplicate(self.request("key"), "submit_code", payload, self.handler())[0], 200)
+        self.assertEqual(self.calls, [400, 200])
+
+    def test_identical_requests_without_a_key_share_a_short_replay_window(self):
+        payload = {"source_code": "print(1)"}
+
+        deduplicate(self.request(), "submit_code", payload, self.handler())
+        deduplicate(self.request(), "submit_code", payload, self.handler())
+        self.assertEqual(len(self.calls), 1)
+
+        IdempotencyKey.objects.update(completed_at=timezone.now() - timedelta(minutes=1))
+        deduplicate(self.request(), "submit_code", payload, self.handler())
+        self.assertEqual(len(self.calls), 2)
+
+
+class JudgeSchedulerTests(SimpleTestCase):
+    weights = {"deadline": 8, "graded": 4, "interactive": 2, "verify": 1, "rejudge": 0.5}
+
+    def dispatch_order(self, requests):
+        scheduler = JudgeScheduler(1, self.weights)
+        order = []
+        blocker = scheduler._acquire("interactive", "blocker", 1)
+
+        def run(priority, flow):
+            with scheduler.slot(priority, flow, 1):
+                order.append((priority, flow))
+
+        threads = []
+        for priority, flow in requests:
+            thread = threading.Thread(target=run, args=(priority, flow))
+            thread.start()
+            threads.append(thread)
+            wait_until(lambda: scheduler._queued == len(threads))
+
+        scheduler._release(blocker)
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_heavier_classes_are_dispatched_first(self):
+        order = self.dispatch_order([("rejudge", 1), ("graded", 2), ("deadline", 3)])
+
+        self.assertEqual([priority for priority, _ in order], ["deadline", "graded", "rejudge"])
+
+    def test_flows_within_a_class_take_turns(self):
+        order = self.dispatch_order([("graded", "a"), ("graded", "a"), ("graded", "a"), ("graded", "b")])
+
+        self.assertEqual([flow for _, flow in order], ["a", "b", "a", "a"])
+
+
+@echo_backend
+@override_settings(JUDGE_FAIL_FAST_WAVE_SIZE=2, JUDGE_PROBE_FIRST_TEST=True)
+class JudgingPolicyTests(SimpleTestCase):
+    def setUp(self):
+        EchoBackend.runs = []
+        patcher = mock.patch.object(cache_module, "_cache", ResultCache(0, 60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def judge(self, test_cases, policy):
+        status, result_data = submit_and_test_code("echo", PYTHON, test_cases, 262144, 1, policy=policy)
+        self.assertEqual(status, 200)
+        return result_data
+
+    def test_first_failure_probes_then_stops_after_the_failing_wave(self):
+        test_cases = [SimpleNamespace(id=index, stdin=f"{index}", expected_output=f"{index}") for index in range(6)]
+        test_cases[1].expected_output = "wrong"
+
+        result_data = self.judge(test_cases, POLICY_FIRST_FAILURE)
+
+        self.assertEqual(EchoBackend.runs, [[0], [1, 2]])
+        self.assertEqual([result["skipped"] for result in result_data["results"]],
+                         [False, False, False, True, True, True])
+        self.assertEqual(result_data["results"][3]["verdict"], SolutionTestResult.SKIPPED)
+        self.assertEqual(result_data["passed_count"], 2)
+
+    def test_full_policy_judges_everything_in_one_wave(self):
+        test_cases = [SimpleNamespace(id=index, stdin=f"{index}", expected_output="wrong") for index in range(4)]
+
+        result_data = self.judge(test_cases, POLICY_FULL)
+
+        self.assertEqual(EchoBackend.runs, [[0, 1, 2, 3]])
+        self.assertFalse(any(result["skipped"] for result in result_data["results"]))
+
+    def test_custom_input_without_expected_output_is_ran_not_graded(self):
+        result_data = self.judge([SimpleNamespace(id=0, stdin="5\n", expected_output=None)], POLICY_FULL)
+        result = result_data["results"][0]
+
+        self.assertIsNone(result["passed"])
+        self.assertEqual(result["status"], "Ran")
+        self.assertEqual(result["verdict"], SolutionTestResult.RAN)
+
+
+class ResultCacheTests(SimpleTestCase):
+    def test_entries_expire_after_the_ttl(self):
+        cache = ResultCache(10, ttl=60)
+        with mock.patch("code_submission.cache.time.monotonic", return_value=100.0):
+            cache.set("key", {"stdout": "1"})
+        with mock.patch("code_submission.cache.time.monotonic", return_value=159.0):
+            self.assertEqual(cache.get("key"), {"stdout": "1"})
+        with mock.patch("code_submission.cache.time.monotonic", return_value=161.0):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_returns_copies(self):
+        cache = ResultCache(2, ttl=60)
+        cache.set("key", {"status": {"id": ACCEPTED}})
+        cache.get("key")["status"]["id"] = TIME_LIMIT_EXCEEDED
+
+        self.assertEqual(cache.get("key")["status"]["id"], ACCEPTED)
+
+    def test_time_limit_exceeded_is_not_cacheable(self):
+        self.assertTrue(cache_module.is_cacheable({"status": {"id": ACCEPTED}}))
+        self.assertFalse(cache_module.is_cacheable({"status": {"id": TIME_LIMIT_EXCEEDED}}))
+
+
+class JudgeCallbackTests(TestCase):
+    def test_duplicate_callbacks_are_stored_once(self):
+        payload = {"token": "abc", "status": {"id": ACCEPTED}, "stdout": "aGk="}
+
+        self.assertTrue(record_callback(dict(payload)))
+        self.assertFalse(record_callback(dict(payload)))
+        self.assertEqual(JudgeCallback.objects.get(token="abc").payload["stdout"], "hi")
+
+    def test_unfinished_submissions_are_ignored(self):
+        self.assertFalse(record_callback({"token": "abc", "status": {"id": 2}}))
+        self.assertFalse(JudgeCallback.objects.exists())
+
+    @override_settings(JUDGE_CALLBACK_SECRET="secret")
+    def test_malformed_payloads_are_rejected(self):
+        for body in ["[1]", '{"token": "abc", "status": "done"}', "not json",
+                     '{"token": "abc", "status": {"id": 3}, "stdout": 5}']:
+            response = self.client.put("/api/code_submission/judge0_callback/secret", body,
+                                       content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+
+        response = self.client.put("/api/code_submission/judge0_callback/wrong", "{}", content_type="application/json")
+        self.assertEqual(response.status_code, 403)
+
+
+def create_problem(author, stdins):
+    problem = Problem.objects.create(title="Echo", description="", difficulty="easy", example_input="",
+                                     example_output="", solution_code="", created_by=author)
+    for stdin in stdins:
+        ProblemTestCase.objects.create(problem=problem, stdin=stdin, expected_output=stdin)
+    return problem
+
+
+class StaleTestCasesTests(TestCase):
+    def test_only_changed_or_unjudged_tests_are_stale(self):
+        user = User.objects.create(username="student", role="student")
+        problem = create_problem(user, ["1", "2", "3"])
+        fresh, changed, new = problem.test_cases.order_by("id")
+        solution = Solution.objects.create(problem=problem, user=user, code="echo", language_id=PYTHON)
+        SolutionTestResult.objects.create(solution=solution, test_case=fresh, passed=True,
+                                          judged_at=fresh.updated_at + timedelta(seconds=1))
+        SolutionTestResult.objects.create(solution=solution, test_case=changed, passed=True,
+                                          judged_at=changed.updated_at - timedelta(seconds=1))
+
+        self.assertEqual(stale_test_cases(solution, [fresh, changed, new]), [changed, new])
+        self.assertEqual(stale_test_cases(solution, [fresh, changed, new], full=True), [fresh, changed, new])
+
+
+@echo_backend
+class RejudgeResumeTests(TransactionTestCase):
+    def setUp(self):
+        EchoBackend.runs = []
+        patcher = mock.patch.object(cache_module, "_cache", ResultCache(0, 60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resumes_after_the_last_rejudged_solution(self):
+        user = User.objects.create(username="student", role="student")
+        problem = create_problem(user, ["1", "2"])
+        solutions = [Solution.objects.create(problem=problem, user=user, code=f"echo {index}", language_id=PYTHON)
+                     for index in range(3)]
+        job = RejudgeJob.objects.create(problem=problem, status="RUNNING", last_solution_id=solutions[0].id,
+                                        completed_count=1)
+
+        run_rejudge(job, workers=1, per_minute=0)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "DONE")
+        self.assertEqual(job.completed_count, 3)
+        self.assertEqual(len(EchoBackend.runs), 2)
+        self.assertFalse(solutions[0].test_results.exists())
+        for solution in solutions[1:]:
+            solution.refresh_from_db()
+            self.assertEqual(solution.percentage_passed, 100)
+            self.assertEqual(solution.test_results.filter(passed=True).count(), 2)
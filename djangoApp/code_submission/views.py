@@ -1,107 +1,208 @@
-import os
-from typing import List
+import json
+import secrets
+from functools import partial
+from typing import List, Union
 
 import requests
-from dotenv import load_dotenv
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 from ninja import Router
 
 from homeworks.models import Homework
 from problems.models import Problem, TestCase
 from solutions.helpers import create_solution
 from users.authentication import jwt_auth
-from .helpers import submit_and_test_code
+from .admission import JudgeUnavailable, admission_required, get_admission, judge_unreachable, unavailable_response
+from .cache import get_result_cache
+from .callbacks import record_callback
+from .dedup import deduplicate
+from .helpers import POLICY_FULL, RUN_MODE_CUSTOM, custom_test_case, preview_result, sample_test_cases, \
+    submit_and_test_code
+from .judge0 import get_client
+from .metrics import get_registry, render, timed
+from .models import SubmissionJob
+from .ratelimit import ACTION_RUN, ACTION_SUBMIT, ACTION_VERIFY, RateLimitExceeded, enforce_rate_limit
+from .scheduler import PRIORITY_INTERACTIVE, PRIORITY_RANKS, PRIORITY_VERIFY, get_scheduler, submission_priority
+from .streaming import stream_results, wants_ndjson
 from .schemas import CodeSubmissionSchema, CodeSubmissionResultSchema, TestCaseVerifySchema, VerifyCodeSubmissionSchema, \
-    VerifyCodeSubmissionResultSchema, TestCaseResultSchema, TestCaseVerifyResultSchema
+    VerifyCodeSubmissionResultSchema, TestCaseResultSchema, TestCaseVerifyResultSchema, SubmissionJobCreatedSchema, \
+    SubmissionJobSchema, RunCodeSchema, CompactCodeSubmissionResultSchema
 
 code_submission_router = Router(tags=["Code Submission"])
 
-load_dotenv()
 
-judge0_url = os.environ.get("JUDGE_URL").strip()
+def _compact_response(result_data, solution_id=None):
+    return CompactCodeSubmissionResultSchema(
+        solution_id=solution_id,
+        passed_count=result_data["passed_count"],
+        total_count=result_data["total_count"],
+        results=[preview_result(result) for result in result_data["results"]]
+    )
 
 
 @code_submission_router.post("/submit_code", auth=jwt_auth,
-                             response={200: CodeSubmissionResultSchema, 400: dict, 404: dict})
-def submit_code(request, payload: CodeSubmissionSchema):
+                             response={200: Union[CompactCodeSubmissionResultSchema, CodeSubmissionResultSchema],
+                                       400: dict, 404: dict, 409: dict, 422: dict, 429: dict, 503: dict})
+@admission_required
+def submit_code(request, response: HttpResponse, payload: CodeSubmissionSchema, compact: bool = False):
     try:
-        problem = Problem.objects.get(id=payload.problem_id)
-        test_cases = TestCase.objects.filter(problem=problem)
+        with timed("judge_db_load_seconds", payload.language_id, payload.problem_id):
+            problem = Problem.objects.get(id=payload.problem_id)
+            test_cases = list(TestCase.objects.filter(problem=problem, output_pending=False))
+
+            user = request.auth
+            homework = None
+            if payload.homework_id:
+                homework = Homework.objects.get(id=payload.homework_id)
 
-        status, result_data = submit_and_test_code(
+        charge = partial(enforce_rate_limit, user, ACTION_SUBMIT, len(test_cases), homework)
+
+        judge = partial(
+            submit_and_test_code,
             payload.source_code,
             payload.language_id,
             test_cases,
             problem.memory_limit,
-            problem.time_limit
+            problem.time_limit,
+            policy=settings.JUDGE_SUBMIT_POLICY or problem.judge_policy,
+            priority=submission_priority(homework),
+            flow=user.id,
+            comparison_mode=problem.comparison_mode,
+            epsilon=problem.comparison_epsilon,
+            problem_id=problem.id
         )
 
-        if status != 200:
-            return status, result_data
+        def save_solution(percentage_passed, results, outputs=None):
+            with timed("judge_solution_write_seconds", payload.language_id, problem.id):
+                return create_solution(user, problem, payload.source_code, payload.language_id, percentage_passed,
+                                       homework, results=results, outputs=outputs)
 
-        raw_results = result_data["results"]
-        passed_count = result_data["passed_count"]
-        total_count = result_data["total_count"]
+        if wants_ndjson(request):
+            return charge().apply(stream_results(lambda on_result: judge(on_result=on_result, collect_results=False),
+                                                 on_summary=save_solution))
 
-        percentage_passed = int((passed_count / total_count) * 100) if total_count else 0
+        def handle():
+            charge().apply(response)
+            status, result_data = judge()
 
-        user = request.auth
-        homework = None
-        if payload.homework_id:
-            homework = Homework.objects.get(id=payload.homework_id)
+            if status != 200:
+                return status, result_data
 
-        create_solution(user, problem, payload.source_code, payload.language_id, percentage_passed, homework)
+            raw_results = result_data["results"]
+            passed_count = result_data["passed_count"]
+            total_count = result_data["total_count"]
 
-        formatted_results = [
-            TestCaseResultSchema(
-                test_case_id=result['test_case_id'],
-                input=result['input'],
-                expected_output=result['expected_output'],
-                actual_output=result['actual_output'],
-                status=result['status'],
-                passed=result['passed'],
-                memory_exceeded=result['memory_exceeded'],
-                time_exceeded=result['time_exceeded'],
-                compile_output=result['compile_output'],
-                stderr=result['stderr'],
-                message=result['message']
-            ) for result in raw_results
-        ]
+            percentage_passed = int((passed_count / total_count) * 100) if total_count else 0
+
+            solution = save_solution(percentage_passed, raw_results)
+            if compact:
+                return 200, _compact_response(result_data, solution.id)
+
+            formatted_results = [
+                TestCaseResultSchema(
+                    test_case_id=result['test_case_id'],
+                    input=result['input'],
+                    expected_output=result['expected_output'],
+                    actual_output=result['actual_output'],
+                    status=result['status'],
+                    passed=result['passed'],
+                    memory_exceeded=result['memory_exceeded'],
+                    time_exceeded=result['time_exceeded'],
+                    compile_output=result['compile_output'],
+                    stderr=result['stderr'],
+                    message=result['message'],
+                    poll_count=result['poll_count'],
+                    wait_time=result['wait_time'],
+                    cached=result['cached'],
+                    skipped=result['skipped']
+                ) for result in raw_results
+            ]
+
+            return 200, CodeSubmissionResultSchema(results=formatted_results)
 
-        return 200, CodeSubmissionResultSchema(results=formatted_results)
+        return deduplicate(request, "submit_code:compact" if compact else "submit_code", payload, handle)
 
     except Problem.DoesNotExist:
         return 404, {"error": "Problem not found"}
+    except RateLimitExceeded as e:
+        e.decision.apply(response)
+        return 429, {"error": str(e)}
+    except JudgeUnavailable as e:
+        return unavailable_response(e)
+    except requests.RequestException:
+        return unavailable_response(judge_unreachable())
     except Exception as e:
         return 400, {"error": str(e)}
 
 
-@code_submission_router.post("/", auth=jwt_auth, response={200: CodeSubmissionResultSchema, 400: dict})
-def test_code(request, payload: CodeSubmissionSchema):
+@code_submission_router.post("/", auth=jwt_auth,
+                             response={200: Union[CompactCodeSubmissionResultSchema, CodeSubmissionResultSchema],
+                                       400: dict, 404: dict, 409: dict, 422: dict, 429: dict, 503: dict})
+@admission_required
+def test_code(request, response: HttpResponse, payload: RunCodeSchema, compact: bool = False):
     try:
-        problem = Problem.objects.get(id=payload.problem_id)
-        test_cases = TestCase.objects.filter(problem=problem)
+        if payload.mode == RUN_MODE_CUSTOM:
+            if payload.stdin is None:
+                return 400, {"error": "stdin is required for a custom run"}
+            if len(payload.stdin) > settings.JUDGE_CUSTOM_INPUT_MAX_LENGTH:
+                return 400, {"error": f"stdin must be at most {settings.JUDGE_CUSTOM_INPUT_MAX_LENGTH} characters"}
+
+        with timed("judge_db_load_seconds", payload.language_id, payload.problem_id):
+            problem = Problem.objects.get(id=payload.problem_id)
+            if payload.mode == RUN_MODE_CUSTOM:
+                test_cases = [custom_test_case(problem, payload.stdin)]
+            else:
+                test_cases = sample_test_cases(problem)
+
+        if not test_cases:
+            return 400, {"error": "This problem has no sample tests"}
 
-        status, result_data = submit_and_test_code(payload.source_code, payload.language_id, test_cases,
-                                                   problem.memory_limit, problem.time_limit)
+        charge = partial(enforce_rate_limit, request.auth, ACTION_RUN, len(test_cases))
 
-        return status, result_data
+        judge = partial(submit_and_test_code, payload.source_code, payload.language_id, test_cases,
+                        problem.memory_limit, problem.time_limit,
+                        policy=settings.JUDGE_RUN_POLICY or problem.judge_policy,
+                        priority=PRIORITY_INTERACTIVE, flow=request.auth.id,
+                        comparison_mode=problem.comparison_mode, epsilon=problem.comparison_epsilon,
+                        problem_id=problem.id)
+
+        if wants_ndjson(request):
+            return charge().apply(stream_results(lambda on_result: judge(on_result=on_result, collect_results=False)))
+
+        def handle():
+            charge().apply(response)
+            status, result_data = judge()
+            if status == 200 and compact:
+                return 200, _compact_response(result_data)
+            return status, result_data
+
+        return deduplicate(request, "test_code:compact" if compact else "test_code", payload, handle)
 
     except Problem.DoesNotExist:
         return 404, {"error": "Problem not found"}
+    except RateLimitExceeded as e:
+        e.decision.apply(response)
+        return 429, {"error": str(e)}
+    except JudgeUnavailable as e:
+        return unavailable_response(e)
+    except requests.RequestException:
+        return unavailable_response(judge_unreachable())
     except Exception as e:
         return 400, {"error": str(e)}
 
 
-@code_submission_router.get('/languages', response=List[dict])
+@code_submission_router.get('/languages', response={200: List[dict], 503: dict})
+@admission_required
 def list_languages(request):
-    api_url = f"{judge0_url}/languages"
-    response = requests.get(api_url)
+    response = get_client().get("/languages")
     return response.json()
 
 
 @code_submission_router.post("/verify_test_cases", auth=jwt_auth,
-                             response={200: VerifyCodeSubmissionResultSchema, 400: dict})
-def verify_test_cases(request, payload: VerifyCodeSubmissionSchema):
+                             response={200: VerifyCodeSubmissionResultSchema, 400: dict, 429: dict, 503: dict})
+@admission_required
+def verify_test_cases(request, response: HttpResponse, payload: VerifyCodeSubmissionSchema):
     try:
         test_cases = []
         for i, tc in enumerate(payload.test_cases):
@@ -111,14 +212,28 @@ def verify_test_cases(request, payload: VerifyCodeSubmissionSchema):
                 expected_output=tc.expected_output
             ))
 
-        status, result_data = submit_and_test_code(
+        rate_limit = enforce_rate_limit(request.auth, ACTION_VERIFY, len(test_cases))
+        rate_limit.apply(response)
+
+        judge = partial(
+            submit_and_test_code,
             payload.source_code,
             payload.language_id,
             test_cases,
             payload.memory_limit,
-            payload.time_limit
+            payload.time_limit,
+            policy=settings.JUDGE_VERIFY_POLICY or POLICY_FULL,
+            priority=PRIORITY_VERIFY,
+            flow=request.auth.id,
+            comparison_mode=payload.comparison_mode,
+            epsilon=payload.comparison_epsilon
         )
 
+        if wants_ndjson(request):
+            return rate_limit.apply(stream_results(lambda on_result: judge(on_result=on_result, collect_results=False)))
+
+        status, result_data = judge()
+
         if status != 200:
             return status, result_data
 
@@ -131,12 +246,84 @@ def verify_test_cases(request, payload: VerifyCodeSubmissionSchema):
                 status=result['status'],
                 passed=result['passed'],
                 memory_exceeded=result['memory_exceeded'],
-                time_exceeded=result['time_exceeded']
+                time_exceeded=result['time_exceeded'],
+                poll_count=result['poll_count'],
+                wait_time=result['wait_time'],
+                cached=result['cached'],
+                skipped=result['skipped']
             )
             for result in result_data["results"]
         ]
-        response = VerifyCodeSubmissionResultSchema(results=verified_results)
-        return 200, response
+        return 200, VerifyCodeSubmissionResultSchema(results=verified_results)
 
+    except RateLimitExceeded as e:
+        e.decision.apply(response)
+        return 429, {"error": str(e)}
+    except JudgeUnavailable as e:
+        return unavailable_response(e)
+    except requests.RequestException:
+        return unavailable_response(judge_unreachable())
     except Exception as e:
         return 400, {"error": str(e)}
+
+
+@code_submission_router.post("/jobs", auth=jwt_auth,
+                             response={202: SubmissionJobCreatedSchema, 404: dict, 429: dict})
+def create_submission_job(request, response: HttpResponse, payload: CodeSubmissionSchema):
+    try:
+        problem = Problem.objects.get(id=payload.problem_id)
+        homework = None
+        if payload.homework_id:
+            homework = Homework.objects.get(id=payload.homework_id)
+        test_count = TestCase.objects.filter(problem=problem, output_pending=False).count()
+        enforce_rate_limit(request.auth, ACTION_SUBMIT, test_count, homework).apply(response)
+    except Problem.DoesNotExist:
+        return 404, {"error": "Problem not found"}
+    except Homework.DoesNotExist:
+        return 404, {"error": "Homework not found"}
+    except RateLimitExceeded as e:
+        e.decision.apply(response)
+        return 429, {"error": str(e)}
+
+    job = SubmissionJob.objects.create(
+        user=request.auth,
+        problem=problem,
+        homework=homework,
+        source_code=payload.source_code,
+        language_id=payload.language_id,
+        priority=PRIORITY_RANKS[submission_priority(homework)]
+    )
+    return 202, SubmissionJobCreatedSchema(id=job.id, status=job.status)
+
+
+@code_submission_router.get("/jobs/{job_id}", auth=jwt_auth, response={200: SubmissionJobSchema, 404: dict})
+def get_submission_job(request, job_id: int):
+    job = get_object_or_404(SubmissionJob, id=job_id, user=request.auth)
+    return 200, SubmissionJobSchema.from_orm(job)
+
+
+@code_submission_router.get("/scheduler", auth=jwt_auth, response={200: dict, 403: dict})
+def scheduler_stats(request):
+    if request.auth.role != 'teacher':
+        return 403, {"error": "Only teachers can access this endpoint"}
+    return 200, dict(get_scheduler().stats(), admission=get_admission().stats(),
+                     result_cache=get_result_cache().stats())
+
+
+@code_submission_router.api_operation(["PUT", "POST"], "/judge0_callback/{secret}", response={200: dict, 400: dict, 403: dict})
+def judge0_callback(request, secret: str):
+    if not settings.JUDGE_CALLBACK_SECRET or not secrets.compare_digest(secret, settings.JUDGE_CALLBACK_SECRET):
+        return 403, {"error": "Invalid callback secret"}
+    try:
+        created = record_callback(json.loads(request.body))
+    except (ValueError, TypeError):
+        return 400, {"error": "Invalid callback payload"}
+
+    return 200, {"success": True, "duplicate": not created}
+
+
+def metrics(request):
+    if not settings.JUDGE_METRICS_TOKEN or not secrets.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {settings.JUDGE_METRICS_TOKEN}"):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(render(get_registry().collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
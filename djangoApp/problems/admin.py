@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from code_submission.rejudge import queue_rejudge
 from .models import Problem, TestCase
 
 
@@ -8,7 +9,7 @@ class ProblemAdmin(admin.ModelAdmin):
     list_display = ('title', 'created_by', 'created_at', 'status')
     list_filter = ('status',)
     search_fields = ('title', 'description', 'created_by__username')
-    actions = ['accept_problems', 'reject_problems']
+    actions = ['accept_problems', 'reject_problems', 'rejudge_problems']
 
     def accept_problems(self, request, queryset):
         for problem in queryset:
@@ -26,5 +27,13 @@ class ProblemAdmin(admin.ModelAdmin):
 
     reject_problems.short_description = 'Reject selected problems'
 
+    def rejudge_problems(self, request, queryset):
+        for problem in queryset:
+            queue_rejudge(problem, requested_by=request.user)
+        self.message_user(request, f'Queued a rejudge for {queryset.count()} problem(s); '
+                                   f'the judge workers will process it.')
+
+    rejudge_problems.short_description = 'Rejudge solutions of selected problems'
+
 
 admin.site.register(TestCase)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0005_problem_memory_limit_problem_restrictions_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='judge_policy',
+            field=models.CharField(choices=[('full', 'Run all tests'), ('first_failure', 'Stop on first failure')], default='full', max_length=20),
+        ),
+    ]
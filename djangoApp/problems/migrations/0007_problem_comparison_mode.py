@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:31
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_expected_digests(apps, schema_editor):
+    TestCase = apps.get_model('problems', 'TestCase')
+    for test_case_id, expected_output in TestCase.objects.values_list('id', 'expected_output').iterator():
+        digest = hashlib.blake2b(expected_output.strip().encode('utf-8'), digest_size=32)
+        TestCase.objects.filter(id=test_case_id).update(expected_digest=f'exact:{digest.hexdigest()}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0006_problem_judge_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='comparison_epsilon',
+            field=models.FloatField(default=1e-06),
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='comparison_mode',
+            field=models.CharField(choices=[('exact', 'Exact (ignoring surrounding whitespace)'), ('tokens', 'Whitespace-separated tokens'), ('lines', 'Lines (ignoring trailing whitespace)'), ('numeric', 'Numeric with tolerance')], default='exact', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='testcase',
+            name='expected_digest',
+            field=models.CharField(blank=True, default='', max_length=80),
+        ),
+        migrations.RunPython(fill_expected_digests, migrations.RunPython.noop),
+    ]
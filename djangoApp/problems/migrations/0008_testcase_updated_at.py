@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0007_problem_comparison_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testcase',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0008_testcase_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='solution_language_id',
+            field=models.IntegerField(default=54),
+        ),
+        migrations.AddField(
+            model_name='testcase',
+            name='reference_memory',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testcase',
+            name='reference_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
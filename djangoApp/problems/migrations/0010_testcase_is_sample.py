@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0009_reference_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testcase',
+            name='is_sample',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0010_testcase_is_sample'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testcase',
+            name='output_pending',
+            field=models.BooleanField(default=False),
+        ),
+    ]
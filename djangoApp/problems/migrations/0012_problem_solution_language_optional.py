@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0011_testcase_output_pending'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='problem',
+            name='solution_language_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
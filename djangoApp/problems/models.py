@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from code_submission.comparators import output_digest
+
 User = get_user_model()
 
 
@@ -41,6 +43,16 @@ class Problem(models.Model):
         ('ACCEPTED', 'Accepted'),
         ('REJECTED', 'Rejected'),
     )
+    JUDGE_POLICIES = (
+        ('full', 'Run all tests'),
+        ('first_failure', 'Stop on first failure'),
+    )
+    COMPARISON_MODES = (
+        ('exact', 'Exact (ignoring surrounding whitespace)'),
+        ('tokens', 'Whitespace-separated tokens'),
+        ('lines', 'Lines (ignoring trailing whitespace)'),
+        ('numeric', 'Numeric with tolerance'),
+    )
 
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -51,12 +63,16 @@ class Problem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='problems')
     solution_code = models.TextField()
+    solution_language_id = models.IntegerField(null=True, blank=True)
     grade = models.IntegerField(choices=GRADES, default=9)
     category = models.CharField(choices=CATEGORIES, max_length=20, default='miscellaneous')
     status = models.CharField(choices=STATUS_CHOICES, max_length=10, default='PENDING')
     memory_limit = models.IntegerField(default=256)
     time_limit = models.IntegerField(default=1)
     restrictions = models.TextField(default='')
+    judge_policy = models.CharField(choices=JUDGE_POLICIES, max_length=20, default='full')
+    comparison_mode = models.CharField(choices=COMPARISON_MODES, max_length=10, default='exact')
+    comparison_epsilon = models.FloatField(default=1e-6)
 
     def __str__(self):
         return self.title
@@ -66,6 +82,22 @@ class TestCase(models.Model):
     problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='test_cases')
     stdin = models.TextField()
     expected_output = models.TextField()
+    expected_digest = models.CharField(max_length=80, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+    reference_time = models.FloatField(null=True, blank=True)
+    reference_memory = models.IntegerField(null=True, blank=True)
+    is_sample = models.BooleanField(default=False)
+    output_pending = models.BooleanField(default=False)
 
     def __str__(self):
         return f"TestCase for {self.problem.title}"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'expected_digest' in update_fields:
+            if TestCase.problem.is_cached(self):
+                comparison_mode = self.problem.comparison_mode
+            else:
+                comparison_mode = Problem.objects.values_list('comparison_mode', flat=True).get(id=self.problem_id)
+            self.expected_digest = output_digest(self.expected_output, comparison_mode)
+        super().save(*args, **kwargs)
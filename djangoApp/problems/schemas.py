@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from django.contrib.auth import get_user_model
 from ninja import Schema
@@ -23,6 +24,10 @@ class ProblemSchema(Schema):
     memory_limit: int
     time_limit: int
     restrictions: str
+    solution_language_id: Optional[int] = None
+    judge_policy: str
+    comparison_mode: str
+    comparison_epsilon: float
 
     @field_validator('created_at', 'updated_at', mode='before')
     def format_datetime(cls, value: datetime) -> str:
@@ -49,6 +54,10 @@ class CreateProblemSchema(Schema):
     memory_limit: int
     time_limit: int
     restrictions: str
+    solution_language_id: Optional[int] = None
+    judge_policy: str = 'full'
+    comparison_mode: str = 'exact'
+    comparison_epsilon: float = 1e-6
 
     @field_validator('difficulty')
     def validate_difficulty(cls, value):
@@ -76,14 +85,67 @@ class CreateProblemSchema(Schema):
             raise ValueError(f'category must be one of {valid_categories}')
         return value
 
+    @field_validator('judge_policy')
+    def validate_judge_policy(cls, value):
+        valid_policies = ['full', 'first_failure']
+        if value not in valid_policies:
+            raise ValueError(f'judge_policy must be one of {valid_policies}')
+        return value
+
+    @field_validator('comparison_mode')
+    def validate_comparison_mode(cls, value):
+        valid_modes = ['exact', 'tokens', 'lines', 'numeric']
+        if value not in valid_modes:
+            raise ValueError(f'comparison_mode must be one of {valid_modes}')
+        return value
+
+    @field_validator('comparison_epsilon')
+    def validate_comparison_epsilon(cls, value):
+        if value < 0:
+            raise ValueError('comparison_epsilon must not be negative')
+        return value
+
 
 class TestCaseSchema(Schema):
     id: int
     problem_id: int
     stdin: str
     expected_output: str
+    is_sample: bool
 
 
 class CreateTestCaseSchema(Schema):
     stdin: str
     expected_output: str
+    is_sample: bool = False
+
+
+class BulkTestCaseInputSchema(Schema):
+    inputs: List[str]
+    apply_limits: bool = False
+
+
+class GenerateOutputsSchema(Schema):
+    overwrite: bool = False
+    apply_limits: bool = False
+
+
+class OutputGenerationJobSchema(Schema):
+    id: int
+    problem_id: int
+    status: str
+    total_count: int
+    completed_count: int
+    failed_count: int
+    over_limit_count: int
+    suggested_time_limit: Optional[int] = None
+    suggested_memory_limit: Optional[int] = None
+    error: str
+    created_at: str
+    finished_at: Optional[str] = None
+
+    @field_validator('created_at', 'finished_at', mode='before')
+    def format_datetime(cls, value: datetime) -> str:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
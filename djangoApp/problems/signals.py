@@ -14,3 +14,11 @@ def post_status_update(sender, instance, **kwargs):
     elif instance.status == 'ACCEPTED':
         message = f'Problema ta "{instance.title}" a fost acceptată.'
         Notification.objects.create(user=instance.created_by, message=message)
+
+
+@receiver(post_save, sender=Problem)
+def refresh_expected_digests(sender, instance, **kwargs):
+    stale = instance.test_cases.exclude(expected_digest__startswith=f'{instance.comparison_mode}:')
+    for test_case in stale:
+        test_case.problem = instance
+        test_case.save(update_fields=['expected_digest'])
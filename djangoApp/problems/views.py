@@ -4,9 +4,13 @@ from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from ninja import Router
 
+from code_submission.comparators import output_digest
+from code_submission.generation import queue_output_generation
+from code_submission.models import OutputGenerationJob
 from users.authentication import jwt_auth
 from .models import Problem, TestCase
-from .schemas import ProblemSchema, CreateProblemSchema, TestCaseSchema, CreateTestCaseSchema
+from .schemas import ProblemSchema, CreateProblemSchema, TestCaseSchema, CreateTestCaseSchema, \
+    BulkTestCaseInputSchema, GenerateOutputsSchema, OutputGenerationJobSchema
 
 problems_router = Router(tags=["Problems"])
 User = get_user_model()
@@ -35,7 +39,11 @@ def create_problem(request, payload: CreateProblemSchema):
         category=payload.category,
         memory_limit=payload.memory_limit,
         time_limit=payload.time_limit,
-        restrictions=payload.restrictions
+        restrictions=payload.restrictions,
+        solution_language_id=payload.solution_language_id,
+        judge_policy=payload.judge_policy,
+        comparison_mode=payload.comparison_mode,
+        comparison_epsilon=payload.comparison_epsilon
     )
     return 201, ProblemSchema.from_orm(problem)
 
@@ -55,6 +63,45 @@ def create_test_case(request, problem_id: int, payload: CreateTestCaseSchema):
     test_case = TestCase.objects.create(
         problem_id=problem_id,
         stdin=payload.stdin,
-        expected_output=payload.expected_output
+        expected_output=payload.expected_output,
+        is_sample=payload.is_sample
     )
     return 201, TestCaseSchema.from_orm(test_case)
+
+
+@problems_router.post('/{problem_id}/test_cases/bulk', auth=jwt_auth,
+                      response={202: OutputGenerationJobSchema, 400: dict, 403: dict, 404: dict})
+def create_test_cases_from_inputs(request, problem_id: int, payload: BulkTestCaseInputSchema):
+    problem = get_object_or_404(Problem, id=problem_id)
+    if problem.created_by_id != request.auth.id:
+        return 403, {"error": "Only the author can add test cases to this problem"}
+    if problem.solution_language_id is None:
+        return 400, {"error": "Set the solution language before generating outputs"}
+
+    expected_digest = output_digest('', problem.comparison_mode)
+    TestCase.objects.bulk_create([
+        TestCase(problem=problem, stdin=stdin, expected_output='', expected_digest=expected_digest, output_pending=True)
+        for stdin in payload.inputs
+    ])
+    job = queue_output_generation(problem, requested_by=request.auth, apply_limits=payload.apply_limits)
+    return 202, OutputGenerationJobSchema.from_orm(job)
+
+
+@problems_router.post('/{problem_id}/generate_outputs', auth=jwt_auth,
+                      response={202: OutputGenerationJobSchema, 400: dict, 403: dict, 404: dict})
+def generate_outputs(request, problem_id: int, payload: GenerateOutputsSchema):
+    problem = get_object_or_404(Problem, id=problem_id)
+    if problem.created_by_id != request.auth.id:
+        return 403, {"error": "Only the author can generate outputs for this problem"}
+    if problem.solution_language_id is None:
+        return 400, {"error": "Set the solution language before generating outputs"}
+
+    job = queue_output_generation(problem, requested_by=request.auth, overwrite=payload.overwrite,
+                                  apply_limits=payload.apply_limits)
+    return 202, OutputGenerationJobSchema.from_orm(job)
+
+
+@problems_router.get('/generation_jobs/{job_id}', auth=jwt_auth, response={200: OutputGenerationJobSchema, 404: dict})
+def get_generation_job(request, job_id: int):
+    job = get_object_or_404(OutputGenerationJob, id=job_id, requested_by=request.auth)
+    return 200, OutputGenerationJobSchema.from_orm(job)
@@ -1,14 +1,63 @@
-from .models import Solution, Homework
+from django.conf import settings
+from django.db import transaction
 
+from .models import Solution, Homework, SolutionTestResult, SolutionTestOutput
 
-def create_solution(user, problem, source_code, language_id, percentage_passed, homework=None):
+OUTPUT_BATCH_SIZE = 16
+RESULT_OUTPUT_FIELDS = {"stdout": "actual_output", "stderr": "stderr", "compile_output": "compile_output"}
+
+
+def stored_output(text):
+    return (text or "")[:settings.JUDGE_STORED_OUTPUT_MAX_LENGTH]
+
+
+def build_test_results(solution, results, judged_at):
+    return [
+        SolutionTestResult(
+            solution=solution,
+            test_case_id=result["test_case_id"],
+            passed=result["passed"],
+            verdict=result["verdict"],
+            time_ms=result["time_ms"],
+            memory_kb=result["memory_kb"],
+            judged_at=judged_at
+        ) for result in results
+    ]
+
+
+def _result_outputs(result, index, outputs):
+    if outputs is not None:
+        stored = outputs.read(index)
+        return {column: stored.get(field, "") for column, field in RESULT_OUTPUT_FIELDS.items()}
+    return {column: stored_output(result.get(field)) for column, field in RESULT_OUTPUT_FIELDS.items()}
+
+
+def save_test_results(solution, results, judged_at, outputs=None):
+    test_results = SolutionTestResult.objects.bulk_create(build_test_results(solution, results, judged_at))
+    batch = []
+    for index, (result, test_result) in enumerate(zip(results, test_results)):
+        texts = _result_outputs(result, index, outputs)
+        if any(texts.values()):
+            batch.append(SolutionTestOutput(result=test_result, **texts))
+        if len(batch) >= OUTPUT_BATCH_SIZE:
+            SolutionTestOutput.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        SolutionTestOutput.objects.bulk_create(batch)
+
+
+def create_solution(user, problem, source_code, language_id, percentage_passed, homework=None, results=None,
+                    outputs=None):
     print("create_solution")
-    solution = Solution.objects.create(
-        problem=problem,
-        user=user,
-        code=source_code,
-        language_id=language_id,
-        percentage_passed=percentage_passed,
-        homework=homework
-    )
-    solution.save()
+    with transaction.atomic():
+        solution = Solution.objects.create(
+            problem=problem,
+            user=user,
+            code=source_code,
+            language_id=language_id,
+            percentage_passed=percentage_passed,
+            homework=homework
+        )
+        if results:
+            save_test_results(solution, results, solution.created_at, outputs)
+    return solution
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0008_testcase_updated_at'),
+        ('solutions', '0002_solution_homework'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolutionTestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passed', models.BooleanField(default=False)),
+                ('judged_at', models.DateTimeField()),
+                ('solution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_results', to='solutions.solution')),
+                ('test_case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solution_results', to='problems.testcase')),
+            ],
+            options={
+                'unique_together': {('solution', 'test_case')},
+            },
+        ),
+    ]
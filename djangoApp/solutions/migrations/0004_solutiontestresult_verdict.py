@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+def mark_passed_as_accepted(apps, schema_editor):
+    SolutionTestResult = apps.get_model('solutions', 'SolutionTestResult')
+    SolutionTestResult.objects.filter(passed=True).update(verdict=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('solutions', '0003_solutiontestresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solutiontestresult',
+            name='memory_kb',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solutiontestresult',
+            name='time_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solutiontestresult',
+            name='verdict',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Accepted'), (1, 'Wrong Answer'), (2, 'Time Limit Exceeded'), (3, 'Memory Limit Exceeded'), (4, 'Runtime Error'), (5, 'Compilation Error'), (6, 'Internal Error'), (7, 'Skipped')], default=6),
+        ),
+        migrations.RunPython(mark_passed_as_accepted, migrations.RunPython.noop),
+    ]
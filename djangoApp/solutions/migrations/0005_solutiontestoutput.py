@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('solutions', '0004_solutiontestresult_verdict'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolutionTestOutput',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stdout', models.TextField(blank=True, default='')),
+                ('stderr', models.TextField(blank=True, default='')),
+                ('compile_output', models.TextField(blank=True, default='')),
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='output', to='solutions.solutiontestresult')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('solutions', '0005_solutiontestoutput'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='solutiontestresult',
+            name='verdict',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Accepted'), (1, 'Wrong Answer'), (2, 'Time Limit Exceeded'), (3, 'Memory Limit Exceeded'), (4, 'Runtime Error'), (5, 'Compilation Error'), (6, 'Internal Error'), (7, 'Skipped'), (8, 'Ran')], default=6),
+        ),
+    ]
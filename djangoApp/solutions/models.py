@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from homeworks.models import Homework
 
-from problems.models import Problem
+from problems.models import Problem, TestCase
 
 User = get_user_model()
 
@@ -18,3 +18,50 @@ class Solution(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.problem.title}"
+
+
+class SolutionTestResult(models.Model):
+    ACCEPTED = 0
+    WRONG_ANSWER = 1
+    TIME_LIMIT_EXCEEDED = 2
+    MEMORY_LIMIT_EXCEEDED = 3
+    RUNTIME_ERROR = 4
+    COMPILATION_ERROR = 5
+    INTERNAL_ERROR = 6
+    SKIPPED = 7
+    RAN = 8
+    VERDICTS = (
+        (ACCEPTED, 'Accepted'),
+        (WRONG_ANSWER, 'Wrong Answer'),
+        (TIME_LIMIT_EXCEEDED, 'Time Limit Exceeded'),
+        (MEMORY_LIMIT_EXCEEDED, 'Memory Limit Exceeded'),
+        (RUNTIME_ERROR, 'Runtime Error'),
+        (COMPILATION_ERROR, 'Compilation Error'),
+        (INTERNAL_ERROR, 'Internal Error'),
+        (SKIPPED, 'Skipped'),
+        (RAN, 'Ran'),
+    )
+
+    solution = models.ForeignKey(Solution, on_delete=models.CASCADE, related_name='test_results')
+    test_case = models.ForeignKey(TestCase, on_delete=models.CASCADE, related_name='solution_results')
+    passed = models.BooleanField(default=False)
+    verdict = models.PositiveSmallIntegerField(choices=VERDICTS, default=INTERNAL_ERROR)
+    time_ms = models.PositiveIntegerField(null=True, blank=True)
+    memory_kb = models.PositiveIntegerField(null=True, blank=True)
+    judged_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('solution', 'test_case')
+
+    def __str__(self):
+        return f"{self.solution} - test {self.test_case_id}"
+
+
+class SolutionTestOutput(models.Model):
+    result = models.OneToOneField(SolutionTestResult, on_delete=models.CASCADE, related_name='output')
+    stdout = models.TextField(blank=True, default='')
+    stderr = models.TextField(blank=True, default='')
+    compile_output = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"Output of {self.result}"
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from ninja import Schema
 from pydantic import field_validator
@@ -18,3 +19,18 @@ class SolutionSchema(Schema):
         if isinstance(value, datetime):
             return value.isoformat()
         return value
+
+
+class SolutionTestResultSchema(Schema):
+    test_case_id: int
+    passed: bool
+    verdict: int
+    verdict_label: str
+    time_ms: Optional[int] = None
+    memory_kb: Optional[int] = None
+
+
+class SolutionResultsSchema(Schema):
+    solution_id: int
+    percentage_passed: int
+    results: List[SolutionTestResultSchema]
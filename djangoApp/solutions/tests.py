@@ -1,2 +1,92 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from code_submission import cache as cache_module
+from code_submission.cache import ResultCache
+from problems.models import Problem, TestCase as ProblemTestCase
+from .models import SolutionTestResult
+
+User = get_user_model()
+
+LARGE_INPUT = "0123456789abcdef\n" * 10000
+
+
+@override_settings(JUDGE_BACKEND_CLASSES={"echo": "code_submission.tests.EchoBackend"},
+                   JUDGE_DEFAULT_BACKEND="echo", JUDGE_LANGUAGE_BACKENDS={}, JUDGE_RATE_LIMIT_ENABLED=False)
+class SolutionOutputTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(cache_module, "_cache", ResultCache(0, 60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.student = User.objects.create(username="student", role="student")
+        self.teacher = User.objects.create(username="teacher", role="teacher")
+        self.problem = Problem.objects.create(title="Echo", description="", difficulty="easy", example_input="",
+                                              example_output="", solution_code="", created_by=self.teacher)
+        self.sample = ProblemTestCase.objects.create(problem=self.problem, stdin="1\n", expected_output="1\n",
+                                                     is_sample=True)
+        self.hidden = ProblemTestCase.objects.create(problem=self.problem, stdin=LARGE_INPUT,
+                                                     expected_output=LARGE_INPUT)
+
+    def get(self, user, path):
+        return self.client.get(path, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def submit(self):
+        response = self.client.post("/api/code_submission/submit_code?compact=true",
+                                    json.dumps({"problem_id": self.problem.id, "language_id": 71,
+                                                "source_code": "echo"}),
+                                    content_type="application/json",
+                                    HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.student)}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def output(self, user, solution_id, test_case_id, field):
+        response = self.get(user, f"/api/solutions/{solution_id}/results/{test_case_id}/{field}")
+        content = b"".join(response.streaming_content).decode() if response.status_code == 200 else None
+        return response.status_code, content
+
+    def test_compact_submission_returns_previews(self):
+        body = self.submit()
+
+        self.assertEqual((body["passed_count"], body["total_count"]), (2, 2))
+        preview = next(result for result in body["results"]
+                       if result["test_case_id"] == self.hidden.id)["actual_output"]
+        self.assertTrue(preview["truncated"])
+        self.assertEqual(preview["bytes"], len(LARGE_INPUT))
+        self.assertLess(len(preview["head"]) + len(preview["tail"]), 1024)
+
+    def test_results_are_listed_without_outputs(self):
+        solution_id = self.submit()["solution_id"]
+
+        response = self.get(self.student, f"/api/solutions/{solution_id}/results")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(row["test_case_id"], row["verdict"]) for row in response.json()["results"]],
+                         [(self.sample.id, SolutionTestResult.ACCEPTED), (self.hidden.id, SolutionTestResult.ACCEPTED)])
+        self.assertNotIn("stdout", response.json()["results"][0])
+
+    def test_full_output_is_streamed_in_slices(self):
+        solution_id = self.submit()["solution_id"]
+
+        self.assertEqual(self.output(self.student, solution_id, self.hidden.id, "stdout"), (200, LARGE_INPUT))
+        self.assertEqual(self.output(self.student, solution_id, self.hidden.id, "stderr"), (200, ""))
+
+    def test_hidden_test_data_is_only_visible_to_teachers(self):
+        solution_id = self.submit()["solution_id"]
+
+        self.assertEqual(self.output(self.student, solution_id, self.hidden.id, "input")[0], 403)
+        self.assertEqual(self.output(self.student, solution_id, self.hidden.id, "expected_output")[0], 403)
+        self.assertEqual(self.output(self.student, solution_id, self.sample.id, "input"), (200, "1\n"))
+        self.assertEqual(self.output(self.teacher, solution_id, self.hidden.id, "input"), (200, LARGE_INPUT))
+
+    def test_other_students_and_unknown_fields_are_rejected(self):
+        solution_id = self.submit()["solution_id"]
+        other = User.objects.create(username="other", role="student")
+
+        self.assertEqual(self.output(other, solution_id, self.sample.id, "stdout")[0], 403)
+        self.assertEqual(self.output(self.student, solution_id, self.sample.id, "source")[0], 400)
+        self.assertEqual(self.output(self.student, solution_id, 0, "stdout")[0], 404)
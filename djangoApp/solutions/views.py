@@ -1,15 +1,85 @@
 from typing import List
 
+from django.db.models.functions import Substr
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from ninja import Router
 
 from users.authentication import jwt_auth
-from .models import Solution
-from .schemas import SolutionSchema
+from .models import Solution, SolutionTestResult
+from .schemas import SolutionSchema, SolutionResultsSchema, SolutionTestResultSchema
 
 solutions_router = Router(tags=["Solutions"])
 
+RESULT_OUTPUT_FIELDS = ['stdout', 'stderr', 'compile_output']
+TEST_CASE_FIELDS = ['input', 'expected_output']
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+
+def _slices(queryset, column):
+    position = 1
+    while True:
+        chunk = (queryset.annotate(chunk=Substr(column, position, OUTPUT_CHUNK_SIZE))
+                 .values_list('chunk', flat=True)
+                 .first())
+        if chunk:
+            yield chunk
+        if not chunk or len(chunk) < OUTPUT_CHUNK_SIZE:
+            return
+        position += len(chunk)
+
 
 @solutions_router.get('/{user_id}/', auth=jwt_auth, response=List[SolutionSchema])
 def list_solutions(request, user_id: int):
     solutions = Solution.objects.filter(user_id=user_id)
     return [SolutionSchema.from_orm(solution) for solution in solutions]
+
+
+@solutions_router.get('/{solution_id}/results', auth=jwt_auth, response={200: SolutionResultsSchema, 403: dict})
+def get_solution_results(request, solution_id: int):
+    solution = get_object_or_404(Solution, id=solution_id)
+    if solution.user_id != request.auth.id and request.auth.role != 'teacher':
+        return 403, {"error": "You can only view your own solutions"}
+
+    verdict_labels = dict(SolutionTestResult.VERDICTS)
+    rows = (SolutionTestResult.objects
+            .filter(solution=solution)
+            .order_by('test_case_id')
+            .values_list('test_case_id', 'passed', 'verdict', 'time_ms', 'memory_kb'))
+    results = [
+        SolutionTestResultSchema(
+            test_case_id=test_case_id,
+            passed=passed,
+            verdict=verdict,
+            verdict_label=verdict_labels[verdict],
+            time_ms=time_ms,
+            memory_kb=memory_kb
+        ) for test_case_id, passed, verdict, time_ms, memory_kb in rows
+    ]
+    return 200, SolutionResultsSchema(solution_id=solution.id, percentage_passed=solution.percentage_passed,
+                                      results=results)
+
+
+@solutions_router.get('/{solution_id}/results/{test_case_id}/{field}', auth=jwt_auth,
+                      response={400: dict, 403: dict, 404: dict})
+def get_result_output(request, solution_id: int, test_case_id: int, field: str):
+    if field not in RESULT_OUTPUT_FIELDS + TEST_CASE_FIELDS:
+        return 400, {"error": f"field must be one of {RESULT_OUTPUT_FIELDS + TEST_CASE_FIELDS}"}
+
+    solution = get_object_or_404(Solution, id=solution_id)
+    if solution.user_id != request.auth.id and request.auth.role != 'teacher':
+        return 403, {"error": "You can only view your own solutions"}
+
+    columns = {'input': 'test_case__stdin', 'expected_output': 'test_case__expected_output'}
+    column = columns.get(field, f'output__{field}')
+    result = SolutionTestResult.objects.filter(solution=solution, test_case_id=test_case_id)
+    is_sample = result.values_list('test_case__is_sample', flat=True).first()
+    if is_sample is None:
+        return 404, {"error": "Result not found"}
+
+    if field in TEST_CASE_FIELDS and request.auth.role != 'teacher' and not is_sample:
+        return 403, {"error": "Hidden test data is only visible to teachers"}
+
+    response = StreamingHttpResponse(_slices(result, column), content_type="text/plain; charset=utf-8")
+    response["Content-Disposition"] = f'inline; filename="{solution_id}-{test_case_id}-{field}.txt"'
+    return response
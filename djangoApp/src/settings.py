@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 import os
 import secrets
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -81,6 +82,103 @@ CORS_ALLOWED_ORIGINS = [
     os.getenv('FRONTEND_URL'),
     os.getenv('FRONTEND_ALTERNATE_URL')
 ]
+CORS_EXPOSE_HEADERS = ['RateLimit-Limit', 'RateLimit-Remaining', 'RateLimit-Reset', 'RateLimit-Policy', 'Retry-After']
+
+JUDGE_EXECUTION_MODE = os.getenv('JUDGE_EXECUTION_MODE', 'batch')
+JUDGE_WORKER_POOL_SIZE = int(os.getenv('JUDGE_WORKER_POOL_SIZE', 16))
+JUDGE_MAX_IN_FLIGHT_REQUESTS = int(os.getenv('JUDGE_MAX_IN_FLIGHT_REQUESTS', 32))
+JUDGE_HTTP_POOL_SIZE = int(os.getenv('JUDGE_HTTP_POOL_SIZE', 32))
+JUDGE_CONNECT_TIMEOUT = float(os.getenv('JUDGE_CONNECT_TIMEOUT', 3))
+JUDGE_READ_TIMEOUT = float(os.getenv('JUDGE_READ_TIMEOUT', 30))
+JUDGE_HTTP_RETRIES = int(os.getenv('JUDGE_HTTP_RETRIES', 3))
+JUDGE_HTTP_RETRY_BACKOFF = float(os.getenv('JUDGE_HTTP_RETRY_BACKOFF', 0.2))
+JUDGE_HEALTH_CHECK_INTERVAL = float(os.getenv('JUDGE_HEALTH_CHECK_INTERVAL', 10))
+JUDGE_HEALTH_CHECK_TIMEOUT = float(os.getenv('JUDGE_HEALTH_CHECK_TIMEOUT', 2))
+JUDGE_NODE_FAILURE_THRESHOLD = int(os.getenv('JUDGE_NODE_FAILURE_THRESHOLD', 3))
+JUDGE_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('JUDGE_CIRCUIT_FAILURE_THRESHOLD', 5))
+JUDGE_CIRCUIT_ERROR_RATE = float(os.getenv('JUDGE_CIRCUIT_ERROR_RATE', 0.5))
+JUDGE_CIRCUIT_WINDOW = int(os.getenv('JUDGE_CIRCUIT_WINDOW', 20))
+JUDGE_CIRCUIT_RESET_TIMEOUT = float(os.getenv('JUDGE_CIRCUIT_RESET_TIMEOUT', 30))
+JUDGE_ADMISSION_MAX_IN_FLIGHT = int(os.getenv('JUDGE_ADMISSION_MAX_IN_FLIGHT', 64))
+JUDGE_ADMISSION_MAX_QUEUE_DEPTH = int(os.getenv('JUDGE_ADMISSION_MAX_QUEUE_DEPTH', 500))
+JUDGE_ADMISSION_RETRY_AFTER = float(os.getenv('JUDGE_ADMISSION_RETRY_AFTER', 5))
+JUDGE_RATE_LIMIT_ENABLED = os.getenv('JUDGE_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+JUDGE_RATE_LIMIT_RUN_CAPACITY = int(os.getenv('JUDGE_RATE_LIMIT_RUN_CAPACITY', 100))
+JUDGE_RATE_LIMIT_RUN_PER_MINUTE = float(os.getenv('JUDGE_RATE_LIMIT_RUN_PER_MINUTE', 50))
+JUDGE_RATE_LIMIT_SUBMIT_CAPACITY = int(os.getenv('JUDGE_RATE_LIMIT_SUBMIT_CAPACITY', 200))
+JUDGE_RATE_LIMIT_SUBMIT_PER_MINUTE = float(os.getenv('JUDGE_RATE_LIMIT_SUBMIT_PER_MINUTE', 100))
+JUDGE_RATE_LIMIT_VERIFY_CAPACITY = int(os.getenv('JUDGE_RATE_LIMIT_VERIFY_CAPACITY', 500))
+JUDGE_RATE_LIMIT_VERIFY_PER_MINUTE = float(os.getenv('JUDGE_RATE_LIMIT_VERIFY_PER_MINUTE', 200))
+JUDGE_RATE_LIMIT_CLASS_FACTOR = float(os.getenv('JUDGE_RATE_LIMIT_CLASS_FACTOR', 20))
+JUDGE_POLL_INITIAL_DELAY = float(os.getenv('JUDGE_POLL_INITIAL_DELAY', 0.05))
+JUDGE_POLL_MAX_DELAY = float(os.getenv('JUDGE_POLL_MAX_DELAY', 1.0))
+JUDGE_POLL_DEADLINE_FACTOR = float(os.getenv('JUDGE_POLL_DEADLINE_FACTOR', 3))
+JUDGE_POLL_DEADLINE_GRACE = float(os.getenv('JUDGE_POLL_DEADLINE_GRACE', 30))
+JUDGE_WAIT_MAX_TIME_LIMIT = float(os.getenv('JUDGE_WAIT_MAX_TIME_LIMIT', 2))
+JUDGE_CALLBACK_URL = os.getenv('JUDGE_CALLBACK_URL', '')
+JUDGE_CALLBACK_SECRET = os.getenv('JUDGE_CALLBACK_SECRET', '')
+JUDGE_CALLBACK_TIMEOUT = float(os.getenv('JUDGE_CALLBACK_TIMEOUT', 15))
+JUDGE_RESULT_CACHE_SIZE = int(os.getenv('JUDGE_RESULT_CACHE_SIZE', 4096))
+JUDGE_RESULT_CACHE_TTL = int(os.getenv('JUDGE_RESULT_CACHE_TTL', 900))
+JUDGE_RESULT_CACHE_MAX_OUTPUT = int(os.getenv('JUDGE_RESULT_CACHE_MAX_OUTPUT', 65536))
+JUDGE_JOB_STALE_AFTER = int(os.getenv('JUDGE_JOB_STALE_AFTER', 300))
+JUDGE_PROBE_FIRST_TEST = os.getenv('JUDGE_PROBE_FIRST_TEST', 'true').lower() == 'true'
+JUDGE_FAIL_FAST_WAVE_SIZE = int(os.getenv('JUDGE_FAIL_FAST_WAVE_SIZE', 5))
+JUDGE_RUN_POLICY = os.getenv('JUDGE_RUN_POLICY', 'first_failure')
+JUDGE_SUBMIT_POLICY = os.getenv('JUDGE_SUBMIT_POLICY', '')
+JUDGE_VERIFY_POLICY = os.getenv('JUDGE_VERIFY_POLICY', 'full')
+JUDGE_CUSTOM_INPUT_MAX_LENGTH = int(os.getenv('JUDGE_CUSTOM_INPUT_MAX_LENGTH', 65536))
+JUDGE_STORED_OUTPUT_MAX_LENGTH = int(os.getenv('JUDGE_STORED_OUTPUT_MAX_LENGTH', 1024 * 1024))
+JUDGE_PREVIEW_LENGTH = int(os.getenv('JUDGE_PREVIEW_LENGTH', 256))
+JUDGE_COMPILE_ONCE = os.getenv('JUDGE_COMPILE_ONCE', 'false').lower() == 'true'
+JUDGE_MAX_CPU_TIME_LIMIT = float(os.getenv('JUDGE_MAX_CPU_TIME_LIMIT', 15))
+JUDGE_MAX_WALL_TIME_LIMIT = float(os.getenv('JUDGE_MAX_WALL_TIME_LIMIT', 20))
+JUDGE_WALL_TIME_FACTOR = float(os.getenv('JUDGE_WALL_TIME_FACTOR', 2))
+JUDGE_WALL_TIME_GRACE = float(os.getenv('JUDGE_WALL_TIME_GRACE', 1))
+JUDGE_CPU_EXTRA_TIME = float(os.getenv('JUDGE_CPU_EXTRA_TIME', 0.5))
+JUDGE_MIN_MEMORY_LIMIT = int(os.getenv('JUDGE_MIN_MEMORY_LIMIT', 2048))
+JUDGE_MAX_MEMORY_LIMIT = int(os.getenv('JUDGE_MAX_MEMORY_LIMIT', 512000))
+JUDGE_DEFAULT_BACKEND = os.getenv('JUDGE_DEFAULT_BACKEND', 'judge0')
+JUDGE_BACKEND_CLASSES = {
+    'judge0': 'code_submission.judge0.Judge0Backend',
+    'local': 'code_submission.sandbox.LocalBackend',
+}
+JUDGE_LANGUAGE_BACKENDS = {
+    int(language_id): backend
+    for language_id, backend in (
+        item.split(':') for item in os.getenv('JUDGE_LANGUAGE_BACKENDS', '').split(',') if item
+    )
+}
+JUDGE_LOCAL_ADDRESS_SPACE_MB = int(os.getenv('JUDGE_LOCAL_ADDRESS_SPACE_MB', 1024))
+JUDGE_LOCAL_MAX_PROCESSES = int(os.getenv('JUDGE_LOCAL_MAX_PROCESSES', 64))
+JUDGE_LOCAL_MAX_OUTPUT_BYTES = int(os.getenv('JUDGE_LOCAL_MAX_OUTPUT_BYTES', 16 * 1024 * 1024))
+JUDGE_LOCAL_COMPILE_TIMEOUT = int(os.getenv('JUDGE_LOCAL_COMPILE_TIMEOUT', 30))
+JUDGE_LOCAL_PATH = os.getenv('JUDGE_LOCAL_PATH', '/usr/local/bin:/usr/bin:/bin')
+JUDGE_LOCAL_PRLIMIT = os.getenv('JUDGE_LOCAL_PRLIMIT', '/usr/bin/prlimit')
+JUDGE_LOCAL_USER = os.getenv('JUDGE_LOCAL_USER', '')
+JUDGE_LOCAL_GROUP = os.getenv('JUDGE_LOCAL_GROUP', '')
+JUDGE_SCHEDULER_SLOTS = int(os.getenv('JUDGE_SCHEDULER_SLOTS', 8))
+JUDGE_PRIORITY_WEIGHTS = {
+    priority: float(weight)
+    for priority, weight in (
+        item.split(':') for item in os.getenv(
+            'JUDGE_PRIORITY_WEIGHTS', 'deadline:8,graded:4,interactive:2,verify:1,rejudge:0.5'
+        ).split(',') if item
+    )
+}
+JUDGE_DEADLINE_WINDOW = int(os.getenv('JUDGE_DEADLINE_WINDOW', 3600))
+JUDGE_REJUDGE_WORKERS = int(os.getenv('JUDGE_REJUDGE_WORKERS', 4))
+JUDGE_REJUDGE_MAX_PER_MINUTE = float(os.getenv('JUDGE_REJUDGE_MAX_PER_MINUTE', 120))
+JUDGE_GENERATION_CHUNK_SIZE = int(os.getenv('JUDGE_GENERATION_CHUNK_SIZE', 50))
+JUDGE_GENERATION_MEMORY_LIMIT = int(os.getenv('JUDGE_GENERATION_MEMORY_LIMIT', 524288))
+JUDGE_REFERENCE_TIME_FACTOR = float(os.getenv('JUDGE_REFERENCE_TIME_FACTOR', 3))
+JUDGE_REFERENCE_MEMORY_FACTOR = float(os.getenv('JUDGE_REFERENCE_MEMORY_FACTOR', 2))
+JUDGE_IDEMPOTENCY_TTL = int(os.getenv('JUDGE_IDEMPOTENCY_TTL', 86400))
+JUDGE_DEDUP_WINDOW = int(os.getenv('JUDGE_DEDUP_WINDOW', 5))
+JUDGE_DEDUP_WAIT_TIMEOUT = int(os.getenv('JUDGE_DEDUP_WAIT_TIMEOUT', 120))
+JUDGE_METRICS_DIR = os.getenv('JUDGE_METRICS_DIR', os.path.join(tempfile.gettempdir(), 'judge-metrics'))
+JUDGE_METRICS_FLUSH_INTERVAL = float(os.getenv('JUDGE_METRICS_FLUSH_INTERVAL', 1.0))
+JUDGE_METRICS_TOKEN = os.getenv('JUDGE_METRICS_TOKEN', '')
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60)
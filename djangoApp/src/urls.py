@@ -3,7 +3,7 @@ from django.urls import path
 from ninja import NinjaAPI
 
 from classes.views import classes_router
-from code_submission.views import code_submission_router
+from code_submission.views import code_submission_router, metrics
 from homeworks.views import homework_router
 from issues.views import issues_router
 from notifications.views import notifications_router
@@ -27,4 +27,5 @@ api.add_router("/issues", issues_router)
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('metrics', metrics),
 ]
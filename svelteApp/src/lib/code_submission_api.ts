@@ -1,20 +1,74 @@
-import axios from 'axios';
+import axios, { type AxiosRequestConfig, type AxiosResponse } from 'axios';
 import { getAuthHeaders } from '$lib/utils';
 
 const API_CODE_SUBMISSION_URL = import.meta.env.VITE_API_SUBMISSIONS_URL;
+const MAX_BACKOFF_RETRIES = 2;
+const MAX_BACKOFF_SECONDS = 30;
+
+const postWithBackoff = async <T>(
+	url: string,
+	body: unknown,
+	config: AxiosRequestConfig
+): Promise<AxiosResponse<T>> => {
+	for (let attempt = 0; ; attempt++) {
+		try {
+			return await axios.post<T>(url, body, config);
+		} catch (error) {
+			if (!axios.isAxiosError(error) || ![429, 503].includes(error.response?.status ?? 0)) {
+				throw error;
+			}
+			const retryAfter = Number(error.response?.headers['retry-after']);
+			if (attempt >= MAX_BACKOFF_RETRIES || !retryAfter || retryAfter > MAX_BACKOFF_SECONDS) {
+				throw error;
+			}
+			await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+		}
+	}
+};
 
 export interface CodeSubmissionResult {
     test_case_id: number;
     input: string;
-    expected_output: string;
+    expected_output: string | null;
     actual_output: string;
     status: string;
-    passed: boolean;
+    passed: boolean | null;
     memory_exceeded: boolean;
     time_exceeded: boolean;
     compile_output?: string | null;
     stderr?: string | null;
     message?: string | null;
+    poll_count?: number | null;
+    wait_time?: number | null;
+    cached?: boolean;
+    skipped?: boolean;
+}
+
+export interface OutputPreview {
+	head: string;
+	tail: string;
+	bytes: number;
+	truncated: boolean;
+}
+
+export interface CompactCodeSubmissionResult {
+	test_case_id: number;
+	status: string;
+	passed: boolean | null;
+	verdict: number;
+	time_ms?: number | null;
+	memory_kb?: number | null;
+	skipped: boolean;
+	actual_output: OutputPreview;
+	stderr: OutputPreview;
+	compile_output: OutputPreview;
+}
+
+export interface CompactCodeSubmissionResponse {
+	solution_id?: number | null;
+	passed_count: number;
+	total_count: number;
+	results: CompactCodeSubmissionResult[];
 }
 
 export interface CodeSubmissionSchema {
@@ -24,6 +78,31 @@ export interface CodeSubmissionSchema {
 	homework_id?: number | null;
 }
 
+export interface RunCodeSchema extends CodeSubmissionSchema {
+	mode?: 'samples' | 'custom';
+	stdin?: string;
+}
+
+export interface SubmissionJob {
+	id: number;
+	problem_id: number;
+	homework_id?: number | null;
+	status: 'PENDING' | 'RUNNING' | 'DONE' | 'FAILED';
+	completed_count: number;
+	total_count: number;
+	percentage_passed?: number | null;
+	results: CodeSubmissionResult[];
+	error: string;
+	created_at: string;
+	finished_at?: string | null;
+}
+
+export interface CodeSubmissionSummary {
+	passed_count: number;
+	total_count: number;
+	percentage_passed: number;
+}
+
 export interface TestCaseVerifySchema {
 	stdin: string;
 	expected_output: string;
@@ -35,14 +114,20 @@ export interface VerifyCodeSubmissionSchema {
 	test_cases: TestCaseVerifySchema[];
 	memory_limit: number;
 	time_limit: number;
+	comparison_mode?: 'exact' | 'tokens' | 'lines' | 'numeric';
+	comparison_epsilon?: number;
 }
 
-export const submitCode = async (submission: CodeSubmissionSchema): Promise<CodeSubmissionResult[]> => {
+export const submitCode = async (
+	submission: CodeSubmissionSchema,
+	idempotencyKey: string = crypto.randomUUID()
+): Promise<CodeSubmissionResult[]> => {
 	try {
-		const response = await axios.post<{ results: CodeSubmissionResult[] }>(
+		const authHeaders = getAuthHeaders();
+		const response = await postWithBackoff<{ results: CodeSubmissionResult[] }>(
 			`${API_CODE_SUBMISSION_URL}/submit_code`,
 			submission,
-			getAuthHeaders()
+			{ headers: { ...authHeaders.headers, 'Idempotency-Key': idempotencyKey } }
 		);
 		console.log('response.data', response.data.results);
 		return response.data.results;
@@ -56,6 +141,78 @@ export const submitCode = async (submission: CodeSubmissionSchema): Promise<Code
 	}
 };
 
+export const runCode = async (submission: RunCodeSchema): Promise<CodeSubmissionResult[]> => {
+	try {
+		const response = await postWithBackoff<{ results: CodeSubmissionResult[] }>(
+			`${API_CODE_SUBMISSION_URL}/`,
+			submission,
+			getAuthHeaders()
+		);
+		return response.data.results;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.error(error.response.data);
+			throw error.response.data;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
+export const submitCodeCompact = async (
+	submission: CodeSubmissionSchema,
+	idempotencyKey: string = crypto.randomUUID()
+): Promise<CompactCodeSubmissionResponse> => {
+	try {
+		const authHeaders = getAuthHeaders();
+		const response = await postWithBackoff<CompactCodeSubmissionResponse>(
+			`${API_CODE_SUBMISSION_URL}/submit_code`,
+			submission,
+			{ headers: { ...authHeaders.headers, 'Idempotency-Key': idempotencyKey }, params: { compact: true } }
+		);
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.error(error.response.data);
+			throw error.response.data;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
+export const createSubmissionJob = async (submission: CodeSubmissionSchema): Promise<{ id: number; status: string }> => {
+	try {
+		const response = await axios.post<{ id: number; status: string }>(
+			`${API_CODE_SUBMISSION_URL}/jobs`,
+			submission,
+			getAuthHeaders()
+		);
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.error(error.response.data);
+			throw error.response.data;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
+export const fetchSubmissionJob = async (jobId: number): Promise<SubmissionJob> => {
+	try {
+		const response = await axios.get<SubmissionJob>(`${API_CODE_SUBMISSION_URL}/jobs/${jobId}`, getAuthHeaders());
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.error(error.response.data);
+			throw error.response.data;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
 export const fetchLanguages = async (): Promise<{ id: number; name: string }[]> => {
 	try {
 		const response = await axios.get(`${API_CODE_SUBMISSION_URL}/languages`, getAuthHeaders());
@@ -72,7 +229,7 @@ export const fetchLanguages = async (): Promise<{ id: number; name: string }[]>
 
 export const verifyTestCases = async (submission: VerifyCodeSubmissionSchema): Promise<CodeSubmissionResult[]> => {
 	try {
-		const response = await axios.post<{ results: CodeSubmissionResult[] }>(
+		const response = await postWithBackoff<{ results: CodeSubmissionResult[] }>(
 			`${API_CODE_SUBMISSION_URL}/verify_test_cases`,
 			submission,
 			getAuthHeaders()
@@ -87,3 +244,60 @@ export const verifyTestCases = async (submission: VerifyCodeSubmissionSchema): P
 		}
 	}
 };
+
+const streamResults = async (
+	path: string,
+	body: CodeSubmissionSchema | RunCodeSchema | VerifyCodeSubmissionSchema,
+	onResult: (result: CompactCodeSubmissionResult) => void
+): Promise<CodeSubmissionSummary> => {
+	const response = await fetch(`${API_CODE_SUBMISSION_URL}${path}`, {
+		method: 'POST',
+		headers: {
+			...getAuthHeaders().headers,
+			Accept: 'application/x-ndjson',
+			'Content-Type': 'application/json'
+		},
+		body: JSON.stringify(body)
+	});
+	if (!response.ok || !response.body) {
+		throw await response.json().catch(() => new Error('An unexpected error occurred'));
+	}
+
+	const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+	let buffer = '';
+	while (true) {
+		const { value, done } = await reader.read();
+		if (done) {
+			break;
+		}
+		buffer += value;
+		const lines = buffer.split('\n');
+		buffer = lines.pop() ?? '';
+		for (const line of lines.filter((line) => line.trim())) {
+			const { type, ...data } = JSON.parse(line);
+			if (type === 'result') {
+				onResult(data as CompactCodeSubmissionResult);
+			} else if (type === 'summary') {
+				return data as CodeSubmissionSummary;
+			} else if (type === 'error') {
+				throw data;
+			}
+		}
+	}
+	throw new Error('The result stream ended unexpectedly');
+};
+
+export const submitCodeStream = (
+	submission: CodeSubmissionSchema,
+	onResult: (result: CompactCodeSubmissionResult) => void
+): Promise<CodeSubmissionSummary> => streamResults('/submit_code', submission, onResult);
+
+export const testCodeStream = (
+	submission: RunCodeSchema,
+	onResult: (result: CompactCodeSubmissionResult) => void
+): Promise<CodeSubmissionSummary> => streamResults('/', submission, onResult);
+
+export const verifyTestCasesStream = (
+	submission: VerifyCodeSubmissionSchema,
+	onResult: (result: CompactCodeSubmissionResult) => void
+): Promise<CodeSubmissionSummary> => streamResults('/verify_test_cases', submission, onResult);
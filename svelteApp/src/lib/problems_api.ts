@@ -11,6 +11,7 @@ export interface ProblemSchema {
 	example_input: string;
 	example_output: string;
 	solution_code: string;
+	solution_language_id: number | null;
 	created_at: string;
 	updated_at: string;
 	created_by: string;
@@ -20,6 +21,9 @@ export interface ProblemSchema {
 	time_limit: number;
 	restrictions: string;
 	status: string;
+	judge_policy: string;
+	comparison_mode: string;
+	comparison_epsilon: number;
 }
 
 export interface TestCase {
@@ -27,11 +31,27 @@ export interface TestCase {
 	problem_id: number;
 	stdin: string;
 	expected_output: string;
+	is_sample: boolean;
 	actualOutput?: string;
 	status?: string;
 	passed?: boolean;
 }
 
+export interface OutputGenerationJob {
+	id: number;
+	problem_id: number;
+	status: 'PENDING' | 'RUNNING' | 'DONE' | 'FAILED';
+	total_count: number;
+	completed_count: number;
+	failed_count: number;
+	over_limit_count: number;
+	suggested_time_limit?: number | null;
+	suggested_memory_limit?: number | null;
+	error: string;
+	created_at: string;
+	finished_at?: string | null;
+}
+
 export interface CreateProblemPayload {
 	title: string;
 	description: string;
@@ -44,6 +64,10 @@ export interface CreateProblemPayload {
 	memory_limit: number;
 	time_limit: number;
 	restrictions: string;
+	solution_language_id?: number;
+	judge_policy?: 'full' | 'first_failure';
+	comparison_mode?: 'exact' | 'tokens' | 'lines' | 'numeric';
+	comparison_epsilon?: number;
 }
 
 export const getAllProblems = async (): Promise<ProblemSchema[]> => {
@@ -90,7 +114,8 @@ export const createProblem = async (problem: CreateProblemPayload): Promise<Prob
 
 export const createTestCase = async (problemId: number, testCase: {
 	stdin: string;
-	expected_output: string
+	expected_output: string;
+	is_sample?: boolean
 }): Promise<TestCase> => {
 	try {
 		const response = await axios.post<TestCase>(`${API_PROBLEMS_URL}/${problemId}/test_cases/`, testCase, getAuthHeaders());
@@ -103,4 +128,60 @@ export const createTestCase = async (problemId: number, testCase: {
 			throw new Error('An unexpected error occurred');
 		}
 	}
-};
\ No newline at end of file
+};
+export const createTestCasesFromInputs = async (
+	problemId: number,
+	inputs: string[],
+	applyLimits = false
+): Promise<OutputGenerationJob> => {
+	try {
+		const response = await axios.post<OutputGenerationJob>(
+			`${API_PROBLEMS_URL}/${problemId}/test_cases/bulk`,
+			{ inputs, apply_limits: applyLimits },
+			getAuthHeaders()
+		);
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.log(error.response.data.errors);
+			throw error.response.data.errors;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
+export const generateOutputs = async (
+	problemId: number,
+	options: { overwrite?: boolean; apply_limits?: boolean } = {}
+): Promise<OutputGenerationJob> => {
+	try {
+		const response = await axios.post<OutputGenerationJob>(
+			`${API_PROBLEMS_URL}/${problemId}/generate_outputs`,
+			options,
+			getAuthHeaders()
+		);
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.log(error.response.data.errors);
+			throw error.response.data.errors;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};
+
+export const fetchGenerationJob = async (jobId: number): Promise<OutputGenerationJob> => {
+	try {
+		const response = await axios.get<OutputGenerationJob>(`${API_PROBLEMS_URL}/generation_jobs/${jobId}`, getAuthHeaders());
+		return response.data;
+	} catch (error) {
+		if (axios.isAxiosError(error) && error.response) {
+			console.log(error.response.data.errors);
+			throw error.response.data.errors;
+		} else {
+			throw new Error('An unexpected error occurred');
+		}
+	}
+};